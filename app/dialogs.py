@@ -0,0 +1,54 @@
+from typing import Optional
+
+from kivy.properties import StringProperty
+from kivy.uix.popup import Popup
+
+
+class ErrorPopup(Popup):
+    message = StringProperty("")
+
+
+class StopPopup(Popup):
+    pass
+
+
+class ConfirmExitPopup(Popup):
+    pass
+
+
+class ConfirmCleaningPopup(Popup):
+    pass
+
+
+class Dialogs:
+    """Popups built once after the kv rules are loaded and reopened on demand."""
+
+    def __init__(self):
+        self.error_popup = ErrorPopup()
+        self.stop_popup = StopPopup()
+        self.confirm_exit_popup = ConfirmExitPopup()
+        self.confirm_cleaning_popup = ConfirmCleaningPopup()
+
+    @staticmethod
+    def _open(popup: Popup) -> Popup:
+        if popup.parent is None:
+            popup.open()
+        return popup
+
+    def show_error(self, message: str) -> Popup:
+        self.error_popup.message = message
+        return self._open(self.error_popup)
+
+    def show_stopped(self) -> Popup:
+        return self._open(self.stop_popup)
+
+    def confirm_exit(self) -> Popup:
+        return self._open(self.confirm_exit_popup)
+
+    def confirm_cleaning(self) -> Popup:
+        return self._open(self.confirm_cleaning_popup)
+
+    def dismiss_all(self, exclude: Optional[Popup] = None) -> None:
+        for popup in (self.error_popup, self.stop_popup, self.confirm_exit_popup, self.confirm_cleaning_popup):
+            if popup is not exclude and popup.parent is not None:
+                popup.dismiss()
@@ -0,0 +1,214 @@
+import logging
+import os
+import resource
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from kivy.clock import Clock
+from kivy.uix.screenmanager import NoTransition
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MemorySample:
+    at: float
+    rss_kb: int
+    traced_kb: int
+    widgets: Dict[str, int] = field(default_factory=dict)
+    textures: Dict[str, int] = field(default_factory=dict)
+
+
+def read_rss_kb() -> int:
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as fh:
+            resident_pages = int(fh.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def count_tree(root) -> Dict[str, int]:
+    widgets = 0
+    textures = set()
+    stack = [root]
+    while stack:
+        widget = stack.pop()
+        widgets += 1
+        texture = getattr(widget, "texture", None)
+        if texture is not None:
+            textures.add(id(texture))
+        stack.extend(widget.children)
+    return {"widgets": widgets, "textures": len(textures)}
+
+
+class MemoryProbe:
+    """tracemalloc, RSS and per-screen widget/texture counts for long-running sessions."""
+
+    def __init__(self, frames: int = 1):
+        self.frames = frames
+        self.samples: List[MemorySample] = []
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._baseline = tracemalloc.take_snapshot()
+
+    def stop(self) -> None:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def sample(self, screen_manager=None) -> MemorySample:
+        traced, _ = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        sample = MemorySample(at=time.monotonic(), rss_kb=read_rss_kb(), traced_kb=traced // 1024)
+        if screen_manager is not None:
+            for screen in screen_manager.screens:
+                counts = count_tree(screen)
+                sample.widgets[screen.name] = counts["widgets"]
+                sample.textures[screen.name] = counts["textures"]
+        self.samples.append(sample)
+        return sample
+
+    def log_every(self, screen_manager, interval_s: float) -> None:
+        def log_sample(*_):
+            sample = self.sample(screen_manager)
+            logger.info(
+                "memory: rss %d kB, traced %d kB, widgets %s, textures %s",
+                sample.rss_kb,
+                sample.traced_kb,
+                sample.widgets,
+                sample.textures,
+            )
+
+        Clock.schedule_interval(log_sample, interval_s)
+
+    def top_growth(self, limit: int = 10) -> List[str]:
+        if self._baseline is None or not tracemalloc.is_tracing():
+            return []
+        stats = tracemalloc.take_snapshot().compare_to(self._baseline, "lineno")
+        return [str(stat) for stat in stats[:limit]]
+
+    def unbounded_growth(self, warmup: int = 2, max_growth_kb: int = 2048) -> List[str]:
+        """Compare the first and last quarter of the post-warmup samples."""
+        samples = self.samples[warmup:]
+        if len(samples) < 4:
+            return []
+        quarter = len(samples) // 4
+        head, tail = samples[:quarter], samples[-quarter:]
+        problems = []
+        for attr in ("traced_kb", "rss_kb"):
+            growth = sum(getattr(s, attr) for s in tail) / quarter - sum(getattr(s, attr) for s in head) / quarter
+            if growth > max_growth_kb:
+                problems.append(f"{attr} grew by {growth:.0f} kB")
+        for name, first in head[0].widgets.items():
+            last = tail[-1].widgets.get(name, first)
+            if last > first:
+                problems.append(f"screen {name}: widgets {first} -> {last}")
+        for name, first in head[0].textures.items():
+            last = tail[-1].textures.get(name, first)
+            if last > first:
+                problems.append(f"screen {name}: textures {first} -> {last}")
+        return problems
+
+
+class SoakTest:
+    """Cycles screens and simulated pours on the UI clock, then checks memory growth."""
+
+    SCREENS = ("home", "settings", "calibration", "home")
+
+    def __init__(self, app, cycles: int, sample_every: int = 50, max_growth_kb: int = 2048):
+        self.app = app
+        self.cycles = cycles
+        self.sample_every = max(sample_every, 1)
+        self.max_growth_kb = max_growth_kb
+        self.probe = MemoryProbe()
+        self.cycle = 0
+        self.pours = 0
+        self.failures: List[str] = []
+
+    def start(self) -> None:
+        self.app.sm.transition = NoTransition()
+        self.app.pour_manager.time_scale = 0.001
+        self._assign_simulated_ingredients()
+        self.probe.start()
+        self.probe.sample(self.app.sm)
+        Clock.schedule_once(self._next_cycle, 0)
+
+    def _next_cycle(self, *_):
+        if self.cycle >= self.cycles:
+            self._finish()
+            return
+        self.cycle += 1
+        for name in self.SCREENS:
+            self.app.sm.current = name
+        self.app.dialogs.dismiss_all()
+
+        recipe = self._available_recipe()
+        if recipe is not None:
+            self.app.pour_manager.run_timings = []
+            self.app.start_pour(recipe)
+            Clock.schedule_once(self._wait_for_pour, 0)
+        else:
+            self._after_pour()
+
+    def _assign_simulated_ingredients(self) -> None:
+        # Fill the simulated pumps in memory only, so the soak run can pour with the shipped
+        # (unassigned) pumps.json without changing it on disk.
+        store = self.app.pump_store
+        free = [pump["id"] for pump in store.pumps if not pump.get("ingredient")]
+        assigned = set(store.ingredient_to_pump())
+        for recipe in self.app.recipe_store.recipes:
+            missing = {step["ingredient"] for step in recipe.get("steps", [])} - assigned
+            if len(missing) > len(free):
+                continue
+            for ingredient in sorted(missing):
+                store.set_ingredient(free.pop(0), ingredient, persist=False)
+                assigned.add(ingredient)
+        logger.info("soak test: %d ingredients on simulated pumps", len(assigned))
+
+    def _available_recipe(self) -> Optional[Dict]:
+        home = self.app.sm.get_screen("home")
+        for item in home.recipes_ui:
+            if item["available"]:
+                return self.app.recipe_store.get_recipe_by_id(item["id"])
+        return None
+
+    def _wait_for_pour(self, *_):
+        if self.app.pour_manager.is_running():
+            Clock.schedule_once(self._wait_for_pour, 0)
+            return
+        if self.app.pour_manager.run_timings:
+            self.pours += 1
+        # Let the scheduled done/stopped callbacks run before moving on.
+        Clock.schedule_once(lambda *_: self._after_pour(), 0)
+
+    def _after_pour(self):
+        self.app.go_home()
+        if self.cycle % self.sample_every == 0:
+            sample = self.probe.sample(self.app.sm)
+            logger.info(
+                "soak cycle %d: rss %d kB, traced %d kB, widgets %d",
+                self.cycle,
+                sample.rss_kb,
+                sample.traced_kb,
+                sum(sample.widgets.values()),
+            )
+        Clock.schedule_once(self._next_cycle, 0)
+
+    def _finish(self):
+        self.probe.sample(self.app.sm)
+        self.failures = self.probe.unbounded_growth(max_growth_kb=self.max_growth_kb)
+        if self.pours == 0:
+            self.failures.append("no pours completed; check recipes and simulated pump assignments")
+        if self.failures:
+            logger.error("soak test FAILED after %d cycles: %s", self.cycle, "; ".join(self.failures))
+            for line in self.probe.top_growth():
+                logger.error("  %s", line)
+        else:
+            logger.info("soak test passed after %d cycles, %d pours", self.cycle, self.pours)
+        self.probe.stop()
+        self.app.stop()
@@ -0,0 +1,180 @@
+import sys
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from kivy.clock import Clock
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+PROFILES_DIR = DATA_DIR / "profiles"
+
+# (file name, function) of frames that mean the thread is blocked, not busy.
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("clock.py", "idle"),
+    ("clock.py", "usleep"),
+    ("clock.py", "_sleep"),
+    # The event-log writer blocks in the C-level SimpleQueue.get, so its own loop is the leaf.
+    ("events.py", "_run"),
+}
+UI_THREAD = "MainThread"
+POUR_THREAD = "pour-worker"
+
+
+class SamplingProfiler:
+    """Samples the stacks of every Python thread at a fixed interval.
+
+    Stacks are aggregated as ``thread;outer;...;inner`` so they can be exported in the
+    collapsed format understood by flamegraph.pl and speedscope. Samples of threads
+    blocked in a known wait (``IDLE_FRAMES``) are dropped, and leaf functions are
+    counted per thread so idle helper threads do not crowd out the UI and pour worker.
+    """
+
+    def __init__(self, interval_s: float = 0.005, max_depth: int = 48):
+        self.interval_s = interval_s
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.leaf_counts: Dict[str, Counter] = {}
+        self.samples = 0
+        self.idle_samples = 0
+        self.sampling_s = 0.0
+        self.started_at = 0.0
+        self._labels: Dict[object, str] = {}
+        self._idle_codes: Dict[object, bool] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.reset()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stacks.clear()
+            self.leaf_counts.clear()
+        self.samples = 0
+        self.idle_samples = 0
+        self.sampling_s = 0.0
+        self.started_at = time.monotonic()
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+        return label
+
+    def _is_idle(self, code) -> bool:
+        idle = self._idle_codes.get(code)
+        if idle is None:
+            idle = self._idle_codes[code] = (Path(code.co_filename).name, code.co_name) in IDLE_FRAMES
+        return idle
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            began = time.perf_counter()
+            frames = sys._current_frames()
+            if any(ident not in self._thread_names for ident in frames):
+                # A new thread (e.g. each pour's worker) appeared; name it from its very first sample.
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                # Threads started outside the threading module never show up in enumerate(); keep
+                # their ident as the name so they do not force a refresh on every sample.
+                self._thread_names = {ident: names.get(ident, str(ident)) for ident in frames}
+            for ident, frame in frames.items():
+                if ident == own_ident:
+                    continue
+                if self._is_idle(frame.f_code):
+                    self.idle_samples += 1
+                    continue
+                stack: List[str] = []
+                while frame is not None and len(stack) < self.max_depth:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                if not stack:
+                    continue
+                thread_name = self._thread_names[ident]
+                with self._lock:
+                    self.stacks[(thread_name,) + tuple(reversed(stack))] += 1
+                    self.leaf_counts.setdefault(thread_name, Counter())[stack[0]] += 1
+            self.samples += 1
+            self.sampling_s += time.perf_counter() - began
+
+    def overhead(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return self.sampling_s / elapsed if elapsed > 0 else 0.0
+
+    def top_functions(
+        self, limit: int = 10, threads: Optional[Iterable[str]] = None, exclude: Iterable[str] = ()
+    ) -> List[Tuple[str, float]]:
+        """Busiest leaf functions as (label, share of the selected threads' busy samples)."""
+        excluded = set(exclude)
+        combined: Counter = Counter()
+        with self._lock:
+            for thread_name, counts in self.leaf_counts.items():
+                if thread_name in excluded or (threads is not None and thread_name not in threads):
+                    continue
+                combined.update(counts)
+        total = sum(combined.values())
+        if not total:
+            return []
+        return [(label, count / total) for label, count in combined.most_common(limit)]
+
+    def collapsed(self) -> List[str]:
+        with self._lock:
+            stacks = self.stacks.most_common()
+        return [f"{';'.join(stack)} {count}" for stack, count in stacks]
+
+    def export_collapsed(self, directory: Path = PROFILES_DIR) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"profile-{time.strftime('%Y%m%d-%H%M%S')}.collapsed"
+        path.write_text("\n".join(self.collapsed()) + "\n", encoding="utf-8")
+        return path
+
+
+class FrameTimer:
+    """Keeps the most recent Kivy frame intervals."""
+
+    def __init__(self, history: int = 300):
+        self.frames: Deque[float] = deque(maxlen=history)
+        self._event = None
+
+    def start(self) -> None:
+        if self._event is None:
+            self.frames.clear()
+            self._event = Clock.schedule_interval(self._tick, 0)
+
+    def stop(self) -> None:
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+
+    def _tick(self, dt: float) -> None:
+        self.frames.append(dt)
+
+    def stats_ms(self) -> Tuple[float, float]:
+        if not self.frames:
+            return 0.0, 0.0
+        return sum(self.frames) / len(self.frames) * 1000, max(self.frames) * 1000
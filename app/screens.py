@@ -1,15 +1,11 @@
-from functools import partial
 from pathlib import Path
 from time import monotonic
 from typing import Dict, List, Optional
 
-import json
-
 from kivy.app import App
 from kivy.clock import Clock
 from kivy.properties import BooleanProperty, ListProperty, NumericProperty, StringProperty
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.uix.recycleview import RecycleView
@@ -20,7 +16,9 @@ from kivy.uix.textinput import TextInput
 from kivy.metrics import dp
 from kivy.graphics import Color, RoundedRectangle
 
+from app.profiler import POUR_THREAD, UI_THREAD
 from core.availability import sort_recipes_by_availability
+from core.search import SearchIndex
 
 
 class HeaderBar(BoxLayout):
@@ -48,19 +46,41 @@ class CocktailCard(BoxLayout):
 
 
 class HomeScreen(Screen):
+    SEARCH_DEBOUNCE_S = 0.2
+
     selected_recipe_id = StringProperty("")
     selected_recipe_name = StringProperty("")
     selected_available = BooleanProperty(False)
+    selected_estimate_text = StringProperty("")
     recipes_ui = ListProperty([])
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._ingredient_map: Dict[str, Dict] = {}
+        self._image_sources: Dict[Optional[str], str] = {}
+        self._cards: Dict[str, CocktailCard] = {}
+        self._filter_trigger = Clock.create_trigger(self.apply_filter, self.SEARCH_DEBOUNCE_S)
+
     def on_pre_enter(self, *args):
         self.refresh()
 
     def refresh(self):
         app = self.manager.app
-        ingredient_map = app.pump_store.ingredient_to_pump()
-        recipes = sort_recipes_by_availability(app.recipe_store.recipes, ingredient_map)
-        self.recipes_ui = [
+        self._ingredient_map = app.pump_store.ingredient_to_pump()
+        known = {recipe.get("id") for recipe in app.recipe_store.recipes}
+        self._cards = {recipe_id: card for recipe_id, card in self._cards.items() if recipe_id in known}
+        self.apply_filter(force=True)
+
+    def schedule_filter(self):
+        self._filter_trigger()
+
+    def apply_filter(self, *_, force: bool = False):
+        app = self.manager.app
+        matches = app.recipe_store.search().query(self.ids.recipe_search.text)
+        recipes = sort_recipes_by_availability(matches, self._ingredient_map)
+        if self.ids.available_only.state == "down":
+            recipes = [item for item in recipes if item[1]]
+        recipes_ui = [
             {
                 "id": r[0]["id"],
                 "name": r[0]["name"],
@@ -69,21 +89,41 @@ class HomeScreen(Screen):
             }
             for r in recipes
         ]
+        if not force and recipes_ui == self.recipes_ui:
+            return
+        self.recipes_ui = recipes_ui
+
+        cards = [self._card_for(item) for item in self.recipes_ui]
         carousel = self.ids.cocktail_carousel
-        carousel.clear_widgets()
-        for item in self.recipes_ui:
-            card = CocktailCard(
-                recipe_id=item["id"],
-                recipe_name=item["name"],
-                image_path=item["image"],
-                available=item["available"],
-            )
-            carousel.add_widget(card)
+        if list(carousel.slides) != cards:
+            carousel.clear_widgets()
+            for card in cards:
+                carousel.add_widget(card)
         if self.recipes_ui:
             carousel.index = 0
             self.select_by_index(0)
+        else:
+            self.selected_recipe_id = ""
+            self.selected_recipe_name = "No matching cocktails"
+            self.selected_available = False
+            self.selected_estimate_text = ""
+
+    def _card_for(self, item: Dict) -> CocktailCard:
+        card = self._cards.get(item["id"])
+        if card is None:
+            card = self._cards[item["id"]] = CocktailCard(recipe_id=item["id"])
+        card.recipe_name = item["name"]
+        card.image_path = item["image"]
+        card.available = item["available"]
+        return card
 
     def resolve_image_source(self, image_source: Optional[str]) -> str:
+        resolved = self._image_sources.get(image_source)
+        if resolved is None:
+            resolved = self._image_sources[image_source] = self._resolve_image_source(image_source)
+        return resolved
+
+    def _resolve_image_source(self, image_source: Optional[str]) -> str:
         fallback = "atlas://data/images/defaulttheme/button"
         if not image_source:
             return fallback
@@ -109,6 +149,12 @@ class HomeScreen(Screen):
         self.selected_recipe_id = item["id"]
         self.selected_recipe_name = item["name"]
         self.selected_available = item["available"]
+        self.selected_estimate_text = self._estimate_text(item) if item["available"] else ""
+
+    def _estimate_text(self, item: Dict) -> str:
+        app = self.manager.app
+        estimate = app.pour_planner.estimate_s(app.recipe_store.get_recipe_by_id(item["id"]))
+        return f"~{estimate:.0f} s" if estimate is not None else ""
 
     def on_carousel_index(self, index: Optional[int]):
         self.select_by_index(index)
@@ -154,43 +200,62 @@ class AssignableDrinkRow(RecycleDataViewBehavior, ButtonBehavior, Label):
 
 
 class AssignPumpScreen(Screen):
+    SEARCH_DEBOUNCE_S = 0.15
+    UNASSIGNED = "<unassigned>"
+
     pump_id = NumericProperty(-1)
     pump_title = StringProperty("")
-    current_drink = StringProperty("<unassigned>")
+    current_drink = StringProperty(UNASSIGNED)
     selected_drink = StringProperty("")
-    drink_options = ListProperty([])
 
-    def configure(self, pump: dict, options: List[str]):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._index: Optional[SearchIndex] = None
+        self._visible: List[str] = []
+        self._search_trigger = Clock.create_trigger(self.render_list, self.SEARCH_DEBOUNCE_S)
+
+    def configure(self, pump: dict, index: SearchIndex):
         self.pump_id = pump["id"]
         self.pump_title = f"Pump {pump['id']}"
-        self.current_drink = pump.get("ingredient") or "<unassigned>"
+        self.current_drink = pump.get("ingredient") or self.UNASSIGNED
         self.selected_drink = self.current_drink
-        self.drink_options = sorted(options)
+        self._index = index
+        self._visible = []
         self.render_list()
 
-    def render_list(self):
-        term = self.ids.drink_search.text.lower().strip()
-        options = ["<unassigned>"] + self.drink_options
-        self.ids.drink_rv.data = [
-            {
-                "text": drink,
-                "drink": drink,
-                "selected": drink == self.selected_drink,
-                "assign_screen": self,
-            }
-            for drink in options
-            if not term or term in drink.lower()
-        ]
+    def schedule_search(self):
+        self._search_trigger()
+
+    def render_list(self, *_):
+        if self._index is None:
+            return
+        visible = [self.UNASSIGNED] + self._index.search(self.ids.drink_search.text)
+        if visible == self._visible:
+            return
+        self._visible = visible
+        self.ids.drink_rv.data = [self._row(drink) for drink in visible]
+
+    def _row(self, drink: str) -> Dict:
+        return {
+            "text": drink,
+            "drink": drink,
+            "selected": drink == self.selected_drink,
+            "assign_screen": self,
+        }
 
     def select_drink(self, drink: str):
+        previous = self.selected_drink
         self.selected_drink = drink
-        self.render_list()
+        data = self.ids.drink_rv.data
+        for idx, item in enumerate(data):
+            if item["drink"] in (previous, drink):
+                data[idx] = self._row(item["drink"])
 
     def back_to_settings(self):
         self.manager.current = "settings"
 
     def save_assignment(self):
-        ingredient = None if self.selected_drink == "<unassigned>" else self.selected_drink
+        ingredient = None if self.selected_drink == self.UNASSIGNED else self.selected_drink
         app = self.manager.app
         app.pump_store.set_ingredient(self.pump_id, ingredient)
         app.refresh_home()
@@ -204,35 +269,25 @@ class SettingsScreen(Screen):
         self.refresh()
 
     def confirm_exit(self):
-        app = self.manager.app
-        content = BoxLayout(orientation="vertical", spacing=dp(10), padding=dp(10))
-        content.add_widget(Label(text="Exit CocktailBot?\nPumps will be stopped safely."))
-        actions = BoxLayout(size_hint_y=None, height=dp(56), spacing=dp(10))
-        popup = Popup(
-            title="Confirm Exit",
-            size_hint=(0.62, 0.34),
-            auto_dismiss=False,
-        )
-        cancel_btn = Button(text="Cancel")
-        exit_btn = Button(text="Exit")
-        cancel_btn.bind(on_release=lambda *_: popup.dismiss())
-
-        def do_exit(*_):
-            popup.dismiss()
-            app.safe_shutdown()
-            app.stop()
-
-        exit_btn.bind(on_release=do_exit)
-        actions.add_widget(cancel_btn)
-        actions.add_widget(exit_btn)
-        content.add_widget(actions)
-        popup.content = content
-        popup.open()
+        self.manager.app.dialogs.confirm_exit()
+
+    def confirm_cleaning(self):
+        self.manager.app.dialogs.confirm_cleaning()
 
     def handle_row(self, pump_id: int, kind: str):
         if kind == "calibration":
             self.manager.app.show_calibration()
             return
+        if kind == "profiler":
+            self.manager.app.toggle_profiler()
+            self.refresh()
+            return
+        if kind == "dashboard":
+            self.manager.current = "dashboard"
+            return
+        if kind == "cleaning":
+            self.confirm_cleaning()
+            return
         if kind == "exit":
             self.confirm_exit()
             return
@@ -243,6 +298,14 @@ class SettingsScreen(Screen):
         app = self.manager.app
         rows = [
             {"pump_id": -1, "kind": "calibration", "text": "Open Calibration", "button_text": "Open"},
+            {"pump_id": -3, "kind": "cleaning", "text": "Cleaning Cycle (all pumps)", "button_text": "Start"},
+            {
+                "pump_id": -4,
+                "kind": "profiler",
+                "text": f"Profiler: {'on' if app.profiler.running else 'off'}",
+                "button_text": "Stop" if app.profiler.running else "Start",
+            },
+            {"pump_id": -5, "kind": "dashboard", "text": "Performance Dashboard", "button_text": "Open"},
             {"pump_id": -2, "kind": "exit", "text": "Exit App", "button_text": "Exit"},
         ]
 
@@ -259,179 +322,181 @@ class SettingsScreen(Screen):
 
         self.ids.pump_rv.data = rows
 
-    def _extract_ingredients_from_file(self, recipe_file: Path) -> List[str]:
-        try:
-            payload = json.loads(recipe_file.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
-            return []
-
-        discovered = set()
-        recipes = []
-        if isinstance(payload, list):
-            recipes = [recipe for recipe in payload if isinstance(recipe, dict)]
-        elif isinstance(payload, dict):
-            for key in ("cocktails", "recipes", "drinks"):
-                candidate = payload.get(key)
-                if isinstance(candidate, list):
-                    recipes = [recipe for recipe in candidate if isinstance(recipe, dict)]
-                    break
-
-        for recipe in recipes:
-            for step in recipe.get("steps", []):
-                ingredient = step.get("ingredient") if isinstance(step, dict) else None
-                if ingredient:
-                    discovered.add(ingredient)
-
-            raw_ingredients = recipe.get("ingredients", [])
-            if isinstance(raw_ingredients, dict):
-                discovered.update(i for i in raw_ingredients.keys() if i)
-            elif isinstance(raw_ingredients, list):
-                for item in raw_ingredients:
-                    if isinstance(item, str) and item:
-                        discovered.add(item)
-                    elif isinstance(item, dict):
-                        ingredient = item.get("ingredient") or item.get("name")
-                        if ingredient:
-                            discovered.add(ingredient)
-
-        return sorted(discovered)
-
-    def _collect_picker_ingredients(self) -> List[str]:
-        app = self.manager.app
-        ingredients = sorted(app.recipe_store.get_all_ingredients())
-        if ingredients:
-            return ingredients
-
-        # Recovery path for stale/failed initial store load.
-        app.recipe_store.load()
-        ingredients = sorted(app.recipe_store.get_all_ingredients())
-        if ingredients:
-            return ingredients
-
-        return self._extract_ingredients_from_file(app.recipe_store.recipes_file)
-
     def open_picker(self, pump_id: int, *_):
         app = self.manager.app
-        drinks = self._collect_picker_ingredients()
         pump = next((item for item in app.pump_store.pumps if item["id"] == pump_id), None)
         if not pump:
             return
 
+        index = app.recipe_store.ingredient_index()
+        if not index.keys:
+            # Recovery path for stale/failed initial store load.
+            app.recipe_store.load()
+            index = app.recipe_store.ingredient_index()
+
         assign_screen = self.manager.get_screen("assign_pump")
-        assign_screen.configure(pump, drinks)
+        assign_screen.configure(pump, index)
         self.manager.current = "assign_pump"
 
 
+class CalibrationPanel(BoxLayout):
+    pump_id = NumericProperty(-1)
+    info_text = StringProperty("")
+    status_text = StringProperty("Manual 100ml: not measured yet")
+    hold_text = StringProperty("Hold for Manual")
+
+
 class CalibrationScreen(Screen):
+    LIVE_REFRESH_S = 0.2
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self._panels: Dict[int, CalibrationPanel] = {}
         self._manual_started_at: Dict[int, float] = {}
         self._manual_elapsed_s: Dict[int, float] = {}
-        self._manual_buttons: Dict[int, Button] = {}
+        self._auto_started_at: Dict[int, float] = {}
+        # Pending timed stops (2 s prime or 10 s run), cancelled when the pump is restarted.
+        self._auto_events: Dict[int, object] = {}
+        self._live_event = None
 
     def on_pre_enter(self, *args):
         self.refresh()
 
     def refresh(self):
-        container = self.ids.calibration_list
-        container.clear_widgets()
         app = self.manager.app
+        pump_ids = [pump["id"] for pump in app.pump_store.pumps]
+        if pump_ids != list(self._panels):
+            self._build_panels(pump_ids)
         for pump in app.pump_store.pumps:
-            panel = BoxLayout(orientation="vertical", size_hint_y=None, height=210, spacing=6)
-
-            info = Label(
-                text=f"Pump {pump['id']} GPIO {pump['gpio']} | Ingredient: {pump.get('ingredient') or '<unassigned>'} | ml/s: {pump.get('ml_per_sec', 0):.2f}",
-                halign="left",
-                valign="middle",
-                size_hint_y=None,
-                height=42,
+            self._update_row(pump)
+
+    def _build_panels(self, pump_ids: List[int]):
+        container = self.ids.calibration_list
+        container.clear_widgets()
+        self._panels = {}
+        for pump_id in pump_ids:
+            panel = CalibrationPanel(pump_id=pump_id)
+            self._panels[pump_id] = panel
+            container.add_widget(panel)
+
+    def _update_row(self, pump: Dict):
+        panel = self._panels.get(pump["id"])
+        if panel is None:
+            return
+        panel.info_text = (
+            f"Pump {pump['id']} GPIO {pump['gpio']} | Ingredient: {pump.get('ingredient') or '<unassigned>'}"
+            f" | ml/s: {pump.get('ml_per_sec', 0):.2f}"
+        )
+
+    def _set_status(self, pump_id: int, text: str):
+        panel = self._panels.get(pump_id)
+        if panel is not None:
+            panel.status_text = text
+
+    def _start_live_readout(self):
+        if self._live_event is None:
+            self._live_event = Clock.schedule_interval(self._update_live_readout, self.LIVE_REFRESH_S)
+
+    def _stop_live_readout(self):
+        if self._live_event is not None and not self._manual_started_at and not self._auto_started_at:
+            self._live_event.cancel()
+            self._live_event = None
+
+    def _estimated_ml(self, pump_id: int, elapsed: float) -> float:
+        pump = self.manager.app.pump_store.get_pump(pump_id)
+        return elapsed * float(pump.get("ml_per_sec", 0))
+
+    def _update_live_readout(self, *_):
+        now = monotonic()
+        for pump_id, started_at in self._auto_started_at.items():
+            elapsed = now - started_at
+            self._set_status(
+                pump_id,
+                f"Auto run: {elapsed:.1f}/10s, ~{self._estimated_ml(pump_id, elapsed):.1f} ml dispensed",
             )
-            info.bind(size=lambda inst, _: setattr(inst, "text_size", inst.size))
-
-            controls = BoxLayout(size_hint_y=None, height=80, spacing=8)
-            prime_btn = Button(text="Prime 2s", size_hint_x=None, width=120)
-            prime_btn.bind(on_release=partial(self.prime, pump["id"]))
-
-            auto_10s_btn = Button(text="Run 10s", size_hint_x=None, width=120)
-            auto_10s_btn.bind(on_release=partial(self.run_ten_seconds, pump["id"]))
-
-            hold_btn = Button(text="Hold for Manual", size_hint_x=None, width=180)
-            hold_btn.bind(on_press=partial(self.manual_start, pump["id"]))
-            hold_btn.bind(on_release=partial(self.manual_stop, pump["id"]))
-            self._manual_buttons[pump["id"]] = hold_btn
-
-            manual_save_btn = Button(text="Save 100ml", size_hint_x=None, width=120)
-            manual_save_btn.bind(on_release=partial(self.save_manual_100ml, pump["id"]))
-
-            controls.add_widget(prime_btn)
-            controls.add_widget(auto_10s_btn)
-            controls.add_widget(hold_btn)
-            controls.add_widget(manual_save_btn)
-
-            measure_row = BoxLayout(size_hint_y=None, height=70, spacing=8)
-            measure_input = TextInput(hint_text="ml measured in 10s", multiline=False, input_filter="float")
-            save_btn = Button(text="Save from 10s", size_hint_x=None, width=170)
-            save_btn.bind(on_release=partial(self.save_calibration, pump["id"], measure_input))
-            measure_row.add_widget(measure_input)
-            measure_row.add_widget(save_btn)
-
-            status = Label(
-                text="Manual 100ml: not measured yet",
-                halign="left",
-                valign="middle",
-                size_hint_y=None,
-                height=32,
+        for pump_id, started_at in self._manual_started_at.items():
+            elapsed = now - started_at
+            self._set_status(
+                pump_id,
+                f"Manual run: {elapsed:.1f}s, ~{self._estimated_ml(pump_id, elapsed):.1f} ml. Release at 100ml.",
             )
-            status.bind(size=lambda inst, _: setattr(inst, "text_size", inst.size))
-            status_id = f"manual_status_{pump['id']}"
-            setattr(self, status_id, status)
-
-            panel.add_widget(info)
-            panel.add_widget(controls)
-            panel.add_widget(measure_row)
-            panel.add_widget(status)
-            container.add_widget(panel)
 
-    def _status_label(self, pump_id: int) -> Label:
-        return getattr(self, f"manual_status_{pump_id}")
+    def _cancel_auto_run(self, pump_id: int):
+        self._auto_started_at.pop(pump_id, None)
+        event = self._auto_events.pop(pump_id, None)
+        if event is not None:
+            event.cancel()
+
+    def _interrupt_other_runs(self, pump_id: int):
+        # Calibration runs are exclusive: starting one pump switches every other pump off.
+        for other_id in list(self._auto_events):
+            if other_id == pump_id:
+                continue
+            if other_id in self._auto_started_at:
+                self._set_status(other_id, "Auto run interrupted: another pump was started.")
+            self._cancel_auto_run(other_id)
+        for other_id in list(self._manual_started_at):
+            if other_id == pump_id:
+                continue
+            self._manual_started_at.pop(other_id)
+            panel = self._panels.get(other_id)
+            if panel is not None:
+                panel.hold_text = "Hold for Manual"
+            self._set_status(other_id, "Manual run interrupted: another pump was started.")
+        self._stop_live_readout()
 
     def prime(self, pump_id: int, *_):
         app = self.manager.app
         app.pour_manager.stop()
+        self._interrupt_other_runs(pump_id)
+        self._cancel_auto_run(pump_id)
+        self._manual_started_at.pop(pump_id, None)
 
         try:
             app.pump_driver.start(pump_id)
-            Clock.schedule_once(lambda *_: app.pump_driver.stop(pump_id), 2)
+            self._auto_events[pump_id] = Clock.schedule_once(lambda *_: self._finish_prime(pump_id), 2)
         except Exception as exc:
             app.show_error(f"Prime failed: {exc}")
 
+    def _finish_prime(self, pump_id: int):
+        self._auto_events.pop(pump_id, None)
+        self.manager.app.pump_driver.stop(pump_id)
+
     def run_ten_seconds(self, pump_id: int, *_):
         app = self.manager.app
         app.pour_manager.stop()
-        status = self._status_label(pump_id)
-        status.text = "Auto run: pumping for 10 seconds..."
+        self._interrupt_other_runs(pump_id)
+        self._cancel_auto_run(pump_id)
+        self._manual_started_at.pop(pump_id, None)
+        self._set_status(pump_id, "Auto run: pumping for 10 seconds...")
         try:
             app.pump_driver.start(pump_id)
-            Clock.schedule_once(lambda *_: self._finish_ten_seconds(pump_id), 10)
+            self._auto_started_at[pump_id] = monotonic()
+            self._start_live_readout()
+            self._auto_events[pump_id] = Clock.schedule_once(lambda *_: self._finish_ten_seconds(pump_id), 10)
         except Exception as exc:
             app.show_error(f"10s calibration failed: {exc}")
 
     def _finish_ten_seconds(self, pump_id: int):
         self.manager.app.pump_driver.stop(pump_id)
-        status = self._status_label(pump_id)
-        status.text = "Auto run complete: measure ml dispensed and use 'Save from 10s'."
+        self._auto_started_at.pop(pump_id, None)
+        self._auto_events.pop(pump_id, None)
+        self._stop_live_readout()
+        self._set_status(pump_id, "Auto run complete: measure ml dispensed and use 'Save from 10s'.")
 
     def manual_start(self, pump_id: int, *_):
         app = self.manager.app
         app.pour_manager.stop()
+        self._interrupt_other_runs(pump_id)
+        self._cancel_auto_run(pump_id)
         self._manual_started_at[pump_id] = monotonic()
-        btn = self._manual_buttons.get(pump_id)
-        if btn:
-            btn.text = "Release to Stop"
-        status = self._status_label(pump_id)
-        status.text = "Manual run: pumping... release button at 100ml."
+        panel = self._panels.get(pump_id)
+        if panel is not None:
+            panel.hold_text = "Release to Stop"
+        self._set_status(pump_id, "Manual run: pumping... release button at 100ml.")
         try:
             app.pump_driver.start(pump_id)
+            self._start_live_readout()
         except Exception as exc:
             app.show_error(f"Manual calibration start failed: {exc}")
 
@@ -439,10 +504,11 @@ class CalibrationScreen(Screen):
         app = self.manager.app
         start = self._manual_started_at.pop(pump_id, None)
         app.pump_driver.stop(pump_id)
+        self._stop_live_readout()
 
-        btn = self._manual_buttons.get(pump_id)
-        if btn:
-            btn.text = "Hold for Manual"
+        panel = self._panels.get(pump_id)
+        if panel is not None:
+            panel.hold_text = "Hold for Manual"
 
         if start is None:
             return
@@ -450,19 +516,19 @@ class CalibrationScreen(Screen):
         elapsed = max(monotonic() - start, 0.01)
         self._manual_elapsed_s[pump_id] = elapsed
         ml_per_sec = 100.0 / elapsed
-        status = self._status_label(pump_id)
-        status.text = f"Manual 100ml time: {elapsed:.2f}s (est {ml_per_sec:.2f} ml/s). Tap Save 100ml."
+        self._set_status(pump_id, f"Manual 100ml time: {elapsed:.2f}s (est {ml_per_sec:.2f} ml/s). Tap Save 100ml.")
 
     def save_manual_100ml(self, pump_id: int, *_):
         elapsed = self._manual_elapsed_s.get(pump_id)
         if not elapsed:
-            self._status_label(pump_id).text = "No manual run recorded yet for this pump."
+            self._set_status(pump_id, "No manual run recorded yet for this pump.")
             return
 
         ml_per_sec = 100.0 / elapsed
-        self.manager.app.pump_store.set_ml_per_sec(pump_id, ml_per_sec)
-        self._status_label(pump_id).text = f"Saved manual calibration: {ml_per_sec:.2f} ml/s"
-        self.refresh()
+        pump_store = self.manager.app.pump_store
+        pump_store.set_ml_per_sec(pump_id, ml_per_sec)
+        self._set_status(pump_id, f"Saved manual calibration: {ml_per_sec:.2f} ml/s")
+        self._update_row(pump_store.get_pump(pump_id))
 
     def save_calibration(self, pump_id: int, measure_input: TextInput, *_):
         text = measure_input.text.strip()
@@ -470,35 +536,116 @@ class CalibrationScreen(Screen):
             return
         ml_in_10s = float(text)
         ml_per_sec = ml_in_10s / 10.0
-        self.manager.app.pump_store.set_ml_per_sec(pump_id, ml_per_sec)
-        self._status_label(pump_id).text = f"Saved 10s calibration: {ml_per_sec:.2f} ml/s"
-        self.refresh()
+        pump_store = self.manager.app.pump_store
+        pump_store.set_ml_per_sec(pump_id, ml_per_sec)
+        self._set_status(pump_id, f"Saved 10s calibration: {ml_per_sec:.2f} ml/s")
+        self._update_row(pump_store.get_pump(pump_id))
 
 
 class PouringScreen(Screen):
+    COUNTDOWN_REFRESH_S = 0.1
+
     status_text = StringProperty("Ready")
     progress_text = StringProperty("0/0")
+    remaining_text = StringProperty("")
+    progress = NumericProperty(0)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._countdown_event = None
+        self._countdown_started_at = 0.0
+        self._countdown_total_s = 0.0
 
     def set_step(self, ingredient: str, step: int, total: int):
         self.status_text = f"Pumping: {ingredient}"
         self.progress_text = f"Step {step}/{total}"
 
+    def start_countdown(self, total_s: float):
+        self.stop_countdown()
+        self._countdown_started_at = monotonic()
+        self._countdown_total_s = total_s
+        self._update_countdown()
+        self._countdown_event = Clock.schedule_interval(self._update_countdown, self.COUNTDOWN_REFRESH_S)
+
+    def stop_countdown(self, finished: bool = False):
+        if self._countdown_event is not None:
+            self._countdown_event.cancel()
+            self._countdown_event = None
+        if finished:
+            self.progress = 100
+            self.remaining_text = ""
+
+    def _update_countdown(self, *_):
+        elapsed = monotonic() - self._countdown_started_at
+        total = self._countdown_total_s
+        self.progress = min(elapsed / total, 1.0) * 100 if total > 0 else 100
+        self.remaining_text = f"{max(total - elapsed, 0.0):.0f} s left"
+
+    def on_leave(self, *args):
+        self.stop_countdown()
+
     def confirm_stop(self):
         app = self.manager.app
         app.stop_pour()
-        popup = Popup(
-            title="Stopped",
-            content=Button(text="Back to Home", on_release=lambda *_: self._close_and_home()),
-            size_hint=(0.6, 0.4),
-        )
-        self._stop_popup = popup
-        popup.open()
+        app.dialogs.show_stopped()
+
+
+class DashboardScreen(Screen):
+    REFRESH_S = 1.0
+
+    summary_text = StringProperty("")
+    functions_text = StringProperty("")
+    pour_text = StringProperty("")
+    export_text = StringProperty("")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._refresh_event = None
 
-    def _close_and_home(self):
-        if hasattr(self, "_stop_popup"):
-            self._stop_popup.dismiss()
-        self.manager.app.go_home()
+    def on_pre_enter(self, *args):
+        self.refresh()
+        self._refresh_event = Clock.schedule_interval(lambda *_: self.refresh(), self.REFRESH_S)
+
+    def on_leave(self, *args):
+        if self._refresh_event is not None:
+            self._refresh_event.cancel()
+            self._refresh_event = None
+
+    def refresh(self):
+        app = self.manager.app
+        profiler = app.profiler
+        avg_ms, max_ms = app.frame_timer.stats_ms()
+        state = "on" if profiler.running else "off"
+        self.summary_text = (
+            f"Profiler {state}: {profiler.samples} samples ({profiler.idle_samples} idle skipped), "
+            f"overhead {profiler.overhead() * 100:.1f}%\n"
+            f"Frame time: avg {avg_ms:.1f} ms, max {max_ms:.1f} ms | Drinks/hour: {app.drinks_per_hour():.0f}"
+        )
+        sections = (
+            ("UI thread", profiler.top_functions(3, threads=(UI_THREAD,))),
+            ("Pour worker", profiler.top_functions(3, threads=(POUR_THREAD,))),
+            ("Other threads", profiler.top_functions(3, exclude=(UI_THREAD, POUR_THREAD))),
+        )
+        lines = []
+        for title, top in sections:
+            lines.append(f"{title}:")
+            lines.extend(f"  {share * 100:5.1f}%  {label}" for label, share in top)
+            if not top:
+                lines.append("  no busy samples")
+        self.functions_text = "\n".join(lines)
+        timings = app.pour_manager.run_timings
+        self.pour_text = "\n".join(
+            f"{timing.label}: planned {timing.planned_s:.2f}s, ran {timing.actual_s:.2f}s" for timing in timings[-6:]
+        ) or "No pour timings yet"
+
+    def export(self):
+        try:
+            path = self.manager.app.profiler.export_collapsed()
+        except OSError as exc:
+            self.export_text = f"Export failed: {exc}"
+            return
+        self.export_text = f"Exported {path.name}"
 
 
 class DoneScreen(Screen):
-    pass
+    message = StringProperty("Cocktail done")
@@ -0,0 +1,35 @@
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Type
+
+from kivy.lang import Builder
+from kivy.uix.screenmanager import Screen
+
+
+logger = logging.getLogger(__name__)
+
+
+class UIBuilder:
+    """Loads the kv rules once and records how long each screen takes to build."""
+
+    def __init__(self, kv_file: Path):
+        self.kv_file = kv_file
+        self.kv_load_ms = 0.0
+        self.build_ms: Dict[str, float] = {}
+
+    def load_kv(self) -> None:
+        filename = str(self.kv_file)
+        if filename in Builder.files:
+            return
+        started = time.perf_counter()
+        Builder.load_file(filename)
+        self.kv_load_ms = (time.perf_counter() - started) * 1000
+        logger.info("kv rules loaded from %s in %.1f ms", self.kv_file.name, self.kv_load_ms)
+
+    def build_screen(self, screen_cls: Type[Screen], name: str) -> Screen:
+        started = time.perf_counter()
+        screen = screen_cls(name=name)
+        self.build_ms[name] = (time.perf_counter() - started) * 1000
+        logger.info("screen %s built in %.1f ms", name, self.build_ms[name])
+        return screen
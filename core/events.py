@@ -0,0 +1,120 @@
+import json
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+EVENTS_FILE = DATA_DIR / "logs" / "events.jsonl"
+
+
+class EventLog:
+    """JSON-lines event log written by a background thread.
+
+    ``emit`` only timestamps the event and puts it on a SimpleQueue, so callers on
+    the pour thread or the UI thread never wait for disk I/O. The file is rotated to
+    ``events.jsonl.1`` .. ``.N`` once it grows past ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        path: Path = EVENTS_FILE,
+        max_bytes: int = 1_000_000,
+        backups: int = 3,
+        max_pending: int = 10_000,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._queue: "queue.SimpleQueue[Optional[Dict]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: float = 2.0) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def emit(self, kind: str, **fields) -> None:
+        if self._queue.qsize() >= self.max_pending:
+            self.dropped += 1
+            return
+        event = {"ts": time.time(), "kind": kind}
+        event.update(fields)
+        self._queue.put(event)
+
+    def _drain(self, first: Dict) -> List[Dict]:
+        batch = [first]
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                return batch
+            if event is None:
+                self._queue.put(None)
+                return batch
+            batch.append(event)
+
+    def _run(self) -> None:
+        fh = self.path.open("a", encoding="utf-8")
+        try:
+            while True:
+                event = self._queue.get()
+                if event is None:
+                    return
+                for item in self._drain(event):
+                    fh.write(json.dumps(item, default=str, separators=(",", ":")))
+                    fh.write("\n")
+                fh.flush()
+                if fh.tell() >= self.max_bytes:
+                    fh.close()
+                    self._rotate()
+                    fh = self.path.open("a", encoding="utf-8")
+        finally:
+            fh.close()
+
+    def _rotate(self) -> None:
+        for idx in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{idx}")
+            if older.exists():
+                older.replace(self.path.with_name(f"{self.path.name}.{idx + 1}"))
+        if self.backups > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+
+_event_log: Optional[EventLog] = None
+
+
+def configure(path: Path = EVENTS_FILE, **kwargs) -> EventLog:
+    global _event_log
+    if _event_log is not None:
+        _event_log.close()
+    _event_log = EventLog(path, **kwargs)
+    _event_log.start()
+    return _event_log
+
+
+def emit(kind: str, **fields) -> None:
+    if _event_log is not None:
+        _event_log.emit(kind, **fields)
+
+
+def shutdown() -> None:
+    global _event_log
+    if _event_log is not None:
+        _event_log.close()
+        _event_log = None
@@ -0,0 +1,364 @@
+"""Streaming bulk import of recipe datasets into ``data/recipes.json``.
+
+Usage::
+
+    python -m core.importer big_dataset.json more.csv [--out data/recipes.json]
+
+JSON inputs use any of the shapes RecipeStore accepts and are parsed one recipe at
+a time. Amounts come from ``steps``, or from ``ingredients`` given either as a
+``{name: ml}`` dict or as a list of ``{ingredient|name, ml|amount}`` entries.
+
+CSV inputs have either one row per recipe with an ``ingredients`` column
+(``vodka:50; cola:200``) or one row per step with ``ingredient`` and ``ml``
+columns; rows of the same recipe must be consecutive.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from json import JSONDecodeError
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from core.recipes import RECIPES_FILE, RecipeStore
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+ALIASES_FILE = DATA_DIR / "ingredient_aliases.json"
+RECIPE_KEYS = ("cocktails", "recipes", "drinks")
+CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_WHITESPACE = " \t\r\n"
+
+
+def slugify(text: str) -> str:
+    return _NON_WORD.sub("_", text.strip().lower()).strip("_")
+
+
+def load_aliases(path: Path = ALIASES_FILE) -> Dict[str, str]:
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as fh:
+        payload = json.load(fh)
+    return {slugify(alias): slugify(target) for alias, target in payload.get("aliases", {}).items()}
+
+
+def normalize_ingredient(name: str, aliases: Dict[str, str]) -> str:
+    slug = slugify(name)
+    return aliases.get(slug, slug)
+
+
+class _JSONStream:
+    """Incremental reader that decodes one JSON value at a time from a text file."""
+
+    def __init__(self, fh: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fh.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in JSON input")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number cut off at the chunk boundary ("1." or "12") decodes too early,
+            # so only trust the end once a delimiter follows it.
+            rest = self.buf[end:end + 64].lstrip(_WHITESPACE)
+            if (not rest or rest[0] not in ",]}:") and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def array_items(self) -> Iterator:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError("Malformed JSON array")
+
+
+def iter_json_recipes(path: Path) -> Iterator[Dict]:
+    with path.open("r", encoding="utf-8") as fh:
+        stream = _JSONStream(fh)
+        first = stream.peek()
+        if first == "[":
+            yield from stream.array_items()
+            return
+        if first != "{":
+            return
+
+        stream.expect("{")
+        while stream.peek() not in ("}", ""):
+            key = stream.value()
+            stream.expect(":")
+            if key in RECIPE_KEYS and stream.peek() == "[":
+                yield from stream.array_items()
+                return
+            stream.value()
+            if stream.peek() == ",":
+                stream.pos += 1
+
+
+def _parse_csv_ingredients(text: str) -> List[Dict]:
+    steps = []
+    for part in re.split(r"[;|]", text):
+        if ":" not in part:
+            continue
+        ingredient, ml = part.rsplit(":", 1)
+        steps.append({"ingredient": ingredient.strip(), "ml": ml.strip()})
+    return steps
+
+
+def _split_tags(text: str) -> List[str]:
+    return [tag.strip() for tag in re.split(r"[,;|]", text) if tag.strip()]
+
+
+def _csv_tags(row: Dict) -> List[str]:
+    return _split_tags(row.get("tags") or "")
+
+
+def iter_csv_recipes(path: Path) -> Iterator[Dict]:
+    with path.open("r", encoding="utf-8", newline="") as fh:
+        reader = csv.DictReader(fh)
+        current: Optional[Dict] = None
+        for row in reader:
+            if row.get("ingredients"):
+                yield {
+                    "id": row.get("id") or "",
+                    "name": row.get("name") or "",
+                    "image": row.get("image") or "",
+                    "tags": _csv_tags(row),
+                    "steps": _parse_csv_ingredients(row["ingredients"]),
+                }
+                continue
+
+            key = row.get("id") or row.get("name") or ""
+            if current is None or current["_key"] != key:
+                if current is not None:
+                    current.pop("_key")
+                    yield current
+                current = {
+                    "_key": key,
+                    "id": row.get("id") or "",
+                    "name": row.get("name") or "",
+                    "image": row.get("image") or "",
+                    "tags": _csv_tags(row),
+                    "steps": [],
+                }
+            current["steps"].append({"ingredient": row.get("ingredient") or "", "ml": row.get("ml") or ""})
+        if current is not None:
+            current.pop("_key")
+            yield current
+
+
+def iter_file_recipes(path: Path) -> Iterator[Dict]:
+    if path.suffix.lower() == ".csv":
+        return iter_csv_recipes(path)
+    return iter_json_recipes(path)
+
+
+@dataclass
+class ImportReport:
+    read: int = 0
+    written: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    elapsed_s: float = 0.0
+    reasons: Counter = field(default_factory=Counter)
+
+    @property
+    def recipes_per_sec(self) -> float:
+        return self.read / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+class RecipeImporter:
+    """Normalises ingredient names, dedupes recipes and streams them into the store file."""
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None):
+        self.aliases = load_aliases() if aliases is None else aliases
+        self._ids: Set[str] = set()
+        self._signatures: Set[Tuple] = set()
+
+    @staticmethod
+    def _raw_steps(raw: Dict) -> List[Tuple[object, object]]:
+        steps = raw.get("steps")
+        if steps:
+            return [(step.get("ingredient"), step.get("ml")) for step in steps if isinstance(step, dict)]
+        ingredients = raw.get("ingredients")
+        if isinstance(ingredients, dict):
+            return list(ingredients.items())
+        if isinstance(ingredients, list):
+            return [
+                (item.get("ingredient") or item.get("name"), item.get("ml", item.get("amount")))
+                for item in ingredients
+                if isinstance(item, dict)
+            ]
+        return []
+
+    def normalize(self, raw) -> Dict:
+        """Return the recipe in store format, or raise ValueError with the reason it was rejected."""
+        if not isinstance(raw, dict):
+            raise ValueError("not an object")
+        name = str(raw.get("name") or "").strip()
+        if not name:
+            raise ValueError("missing name")
+        raw_steps = self._raw_steps(raw)
+        if not raw_steps:
+            if raw.get("ingredients"):
+                raise ValueError("ingredients without amounts")
+            raise ValueError("no steps or ingredients")
+
+        steps = []
+        for raw_ingredient, raw_ml in raw_steps:
+            ingredient = normalize_ingredient(str(raw_ingredient or ""), self.aliases)
+            try:
+                ml = float(raw_ml)
+            except (TypeError, ValueError):
+                continue
+            if ingredient and math.isfinite(ml) and ml > 0:
+                steps.append({"ingredient": ingredient, "ml": int(ml) if ml.is_integer() else ml})
+        if not steps:
+            raise ValueError("no ingredient with a valid ml amount")
+
+        recipe = {"id": slugify(str(raw.get("id") or "")) or slugify(name), "name": name}
+        if raw.get("image"):
+            recipe["image"] = raw["image"]
+        tags = raw.get("tags")
+        if isinstance(tags, str):
+            tags = _split_tags(tags)
+        elif isinstance(tags, list):
+            tags = [str(tag).strip() for tag in tags if str(tag).strip()]
+        else:
+            tags = []
+        if tags:
+            recipe["tags"] = tags
+        recipe["steps"] = steps
+        return recipe
+
+    def accept(self, recipe: Dict) -> bool:
+        signature = (slugify(recipe["name"]),) + tuple(
+            sorted((step["ingredient"], float(step["ml"])) for step in recipe["steps"])
+        )
+        if signature in self._signatures:
+            return False
+        self._signatures.add(signature)
+
+        base_id, suffix = recipe["id"], 2
+        while recipe["id"] in self._ids:
+            recipe["id"] = f"{base_id}_{suffix}"
+            suffix += 1
+        self._ids.add(recipe["id"])
+        return True
+
+    def run(self, sources: Iterable[Path], out_file: Path = RECIPES_FILE, merge: bool = True) -> ImportReport:
+        report = ImportReport()
+        started = time.perf_counter()
+        existing = RecipeStore(out_file).recipes if merge and out_file.exists() else []
+
+        tmp_file = out_file.with_name(out_file.name + ".tmp")
+        with tmp_file.open("w", encoding="utf-8") as fh:
+            fh.write('{\n  "cocktails": [')
+            first = True
+            for recipe in existing:
+                # Existing recipes are kept verbatim so their ids and images stay stable.
+                try:
+                    normalized = self.normalize(recipe)
+                except ValueError:
+                    normalized = None
+                if normalized is not None:
+                    normalized["id"] = recipe.get("id") or normalized["id"]
+                    self.accept(normalized)
+                fh.write(("\n    " if first else ",\n    ") + json.dumps(recipe, ensure_ascii=False))
+                first = False
+                report.written += 1
+
+            for source in sources:
+                for raw in iter_file_recipes(Path(source)):
+                    report.read += 1
+                    try:
+                        recipe = self.normalize(raw)
+                    except ValueError as exc:
+                        report.invalid += 1
+                        report.reasons[str(exc)] += 1
+                        continue
+                    if not self.accept(recipe):
+                        report.duplicates += 1
+                        continue
+                    fh.write(("\n    " if first else ",\n    ") + json.dumps(recipe, ensure_ascii=False))
+                    first = False
+                    report.written += 1
+            fh.write("\n  ]\n}\n")
+        os.replace(tmp_file, out_file)
+
+        report.elapsed_s = time.perf_counter() - started
+        return report
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Import recipe datasets into the CocktailBot recipe store.")
+    parser.add_argument("sources", nargs="+", type=Path, help="JSON or CSV recipe files")
+    parser.add_argument("--out", type=Path, default=RECIPES_FILE, help="recipe store file to write")
+    parser.add_argument("--aliases", type=Path, default=ALIASES_FILE, help="ingredient alias table")
+    parser.add_argument("--replace", action="store_true", help="drop the recipes already in --out")
+    args = parser.parse_args(argv)
+
+    importer = RecipeImporter(load_aliases(args.aliases))
+    report = importer.run(args.sources, out_file=args.out, merge=not args.replace)
+    print(
+        f"read {report.read}, wrote {report.written}, duplicates {report.duplicates}, invalid {report.invalid} "
+        f"in {report.elapsed_s:.2f}s ({report.recipes_per_sec:,.0f} recipes/s)"
+    )
+    for reason, count in report.reasons.most_common():
+        print(f"  invalid: {reason} ({count})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -2,6 +2,8 @@ import json
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from core import events
+
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 PUMPS_FILE = DATA_DIR / "pumps.json"
@@ -11,11 +13,13 @@ class PumpStore:
     def __init__(self, pumps_file: Path = PUMPS_FILE):
         self.pumps_file = pumps_file
         self._data: Dict = {}
+        self.revision = 0
         self.load()
 
     def load(self) -> Dict:
         with self.pumps_file.open("r", encoding="utf-8") as fh:
             self._data = json.load(fh)
+        self.revision += 1
         return self._data
 
     def save(self) -> None:
@@ -33,15 +37,32 @@ class PumpStore:
                 return pump
         raise KeyError(f"Pump '{pump_id}' not found")
 
-    def set_ingredient(self, pump_id: int, ingredient: Optional[str]) -> None:
+    def set_ingredient(self, pump_id: int, ingredient: Optional[str], persist: bool = True) -> None:
         pump = self.get_pump(pump_id)
+        previous = pump.get("ingredient")
         pump["ingredient"] = ingredient
-        self.save()
+        self.revision += 1
+        if persist:
+            self.save()
+        events.emit("store.ingredient", pump_id=pump_id, previous=previous, ingredient=ingredient)
 
     def set_ml_per_sec(self, pump_id: int, ml_per_sec: float) -> None:
         pump = self.get_pump(pump_id)
+        previous = pump.get("ml_per_sec")
         pump["ml_per_sec"] = float(ml_per_sec)
+        self.revision += 1
         self.save()
+        events.emit("store.ml_per_sec", pump_id=pump_id, previous=previous, ml_per_sec=float(ml_per_sec))
+
+    def refine_ml_per_sec(self, pump_id: int, observed_ml_per_sec: float, weight: float = 0.3) -> float:
+        pump = self.get_pump(pump_id)
+        current = float(pump.get("ml_per_sec", 0))
+        refined = observed_ml_per_sec if current <= 0 else current + (observed_ml_per_sec - current) * weight
+        self.set_ml_per_sec(pump_id, refined)
+        return refined
+
+    def scale_config(self) -> Dict:
+        return self._data.get("scale", {})
 
     def ingredient_to_pump(self) -> Dict[str, Dict]:
         mapping: Dict[str, Dict] = {}
@@ -51,5 +72,19 @@ class PumpStore:
                 mapping[ingredient] = pump
         return mapping
 
+    def power_budget(self) -> Dict[str, float]:
+        power = self._data.get("power", {})
+        pump_currents = [float(pump.get("current_a", 1.0)) for pump in self.pumps]
+        return {
+            "max_total_current_a": float(power.get("max_total_current_a", max(pump_currents, default=0.0))),
+            "start_stagger_s": float(power.get("start_stagger_ms", 0)) / 1000.0,
+        }
+
+    def inputs_config(self) -> Dict:
+        return self._data.get("inputs", {})
+
+    def maintenance_config(self) -> Dict:
+        return self._data.get("maintenance", {})
+
     def pump_id_to_gpio(self) -> Dict[int, int]:
         return {pump["id"]: pump["gpio"] for pump in self.pumps}
@@ -1,6 +1,8 @@
 import json
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
+
+from core.search import RecipeSearch, SearchIndex
 
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
@@ -11,12 +13,20 @@ class RecipeStore:
     def __init__(self, recipes_file: Path = RECIPES_FILE):
         self.recipes_file = recipes_file
         self._recipes: List[Dict] = []
+        self._by_id: Dict[str, Dict] = {}
+        self._search: Optional[RecipeSearch] = None
+        self._ingredient_index: Optional[SearchIndex] = None
         self.load()
 
     def load(self) -> List[Dict]:
         with self.recipes_file.open("r", encoding="utf-8") as fh:
             payload = json.load(fh)
         self._recipes = self._extract_recipes(payload)
+        self._by_id = {}
+        for recipe in self._recipes:
+            self._by_id.setdefault(recipe.get("id"), recipe)
+        self._search = None
+        self._ingredient_index = None
         return self._recipes
 
     @staticmethod
@@ -39,9 +49,9 @@ class RecipeStore:
         return self._recipes
 
     def get_recipe_by_id(self, recipe_id: str) -> Dict:
-        for recipe in self._recipes:
-            if recipe.get("id") == recipe_id:
-                return recipe
+        recipe = self._by_id.get(recipe_id)
+        if recipe is not None:
+            return recipe
         raise KeyError(f"Recipe '{recipe_id}' not found")
 
     def get_all_ingredients(self) -> Set[str]:
@@ -52,6 +62,16 @@ class RecipeStore:
                     ingredients.add(ingredient)
         return ingredients
 
+    def search(self) -> RecipeSearch:
+        if self._search is None:
+            self._search = RecipeSearch(self._recipes, self._iter_recipe_ingredients)
+        return self._search
+
+    def ingredient_index(self) -> SearchIndex:
+        if self._ingredient_index is None:
+            self._ingredient_index = SearchIndex(sorted(self.get_all_ingredients()))
+        return self._ingredient_index
+
     def _iter_recipe_ingredients(self, recipe: Dict):
         for step in recipe.get("steps", []):
             ingredient = step.get("ingredient")
@@ -0,0 +1,102 @@
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+GRAM_SIZE = 3
+
+
+def normalize_term(text: str) -> str:
+    return " ".join(text.lower().replace("_", " ").split())
+
+
+class SearchIndex:
+    """Substring search over a fixed list of strings using an n-gram index.
+
+    Results keep the insertion order of the indexed keys. Queries that extend the
+    previous query (typing one more character) narrow the previous result set
+    instead of hitting the index again.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self.keys: List[str] = list(keys)
+        self._normalized: List[str] = [normalize_term(key) for key in self.keys]
+        self._grams: Dict[str, Set[int]] = {}
+        for idx, text in enumerate(self._normalized):
+            for gram in self._iter_grams(text):
+                self._grams.setdefault(gram, set()).add(idx)
+        self._last_term: Optional[str] = None
+        self._last_hits: List[int] = []
+
+    @staticmethod
+    def _iter_grams(text: str):
+        for size in range(1, GRAM_SIZE + 1):
+            for start in range(len(text) - size + 1):
+                yield text[start:start + size]
+
+    def lookup(self, term: str) -> List[int]:
+        grams = {term[i:i + GRAM_SIZE] for i in range(max(len(term) - GRAM_SIZE + 1, 1))}
+        candidates: Optional[Set[int]] = None
+        for gram in sorted(grams, key=lambda g: len(self._grams.get(g, ()))):
+            hits = self._grams.get(gram)
+            if not hits:
+                return []
+            candidates = set(hits) if candidates is None else candidates & hits
+            if not candidates:
+                return []
+        if candidates is None:
+            return []
+        return sorted(idx for idx in candidates if term in self._normalized[idx])
+
+    def search_ids(self, term: str) -> List[int]:
+        term = normalize_term(term)
+        if not term:
+            hits = list(range(len(self.keys)))
+        elif self._last_term and term.startswith(self._last_term):
+            hits = [idx for idx in self._last_hits if term in self._normalized[idx]]
+        else:
+            hits = self.lookup(term)
+        self._last_term = term
+        self._last_hits = hits
+        return hits
+
+    def search(self, term: str) -> List[str]:
+        return [self.keys[idx] for idx in self.search_ids(term)]
+
+
+class RecipeSearch:
+    """Recipe lookup by name, ingredient and tag.
+
+    Free-text terms match the recipe name or any of its ingredients. Terms starting
+    with ``#`` must match one of the recipe's ``tags``.
+    """
+
+    def __init__(self, recipes: List[Dict], ingredients_of: Callable[[Dict], Iterable[str]]):
+        self.recipes = recipes
+        self.names = SearchIndex(recipe.get("name", "") for recipe in recipes)
+        self._ingredients: Dict[str, Set[int]] = {}
+        self._tags: Dict[str, Set[int]] = {}
+        for idx, recipe in enumerate(recipes):
+            for ingredient in ingredients_of(recipe):
+                self._ingredients.setdefault(ingredient, set()).add(idx)
+            for tag in recipe.get("tags", []) or []:
+                self._tags.setdefault(normalize_term(str(tag)), set()).add(idx)
+        self.ingredients = SearchIndex(sorted(self._ingredients))
+
+    def _term_hits(self, term: str) -> Set[int]:
+        if term.startswith("#"):
+            tag = normalize_term(term[1:])
+            return {idx for name, hits in self._tags.items() if name.startswith(tag) for idx in hits}
+        hits = set(self.names.lookup(normalize_term(term)))
+        for ingredient in self.ingredients.search(term):
+            hits |= self._ingredients[ingredient]
+        return hits
+
+    def query(self, text: str) -> List[Dict]:
+        hits: Optional[Set[int]] = None
+        for term in text.split():
+            term_hits = self._term_hits(term)
+            hits = term_hits if hits is None else hits & term_hits
+            if not hits:
+                return []
+        if hits is None:
+            return list(self.recipes)
+        return [self.recipes[idx] for idx in sorted(hits)]
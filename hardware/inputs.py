@@ -0,0 +1,150 @@
+import threading
+from typing import Callable, Dict, List, Optional
+
+from core import events
+from hardware.pour_manager import PourManager
+
+try:
+    from gpiozero import Button as GPIOButton
+except Exception:  # pragma: no cover - dev fallback on non-RPi machines
+    GPIOButton = None
+
+
+Callback = Callable[[], None]
+
+
+class GPIOInputBackend:
+    """Edge events from gpiozero. Callbacks run on gpiozero's own event thread."""
+
+    def __init__(self, bounce_s: float = 0.02):
+        self.bounce_s = bounce_s
+        self.buttons: List = []
+
+    def watch(self, pin: int, on_press: Optional[Callback] = None, on_release: Optional[Callback] = None) -> bool:
+        button = GPIOButton(pin, pull_up=True, bounce_time=self.bounce_s)
+        button.when_pressed = on_press
+        button.when_released = on_release
+        self.buttons.append(button)
+        return bool(button.is_pressed)
+
+    def close(self) -> None:
+        for button in self.buttons:
+            button.close()
+        self.buttons = []
+
+
+class MockInputBackend:
+    """In-memory backend for tests and non-RPi machines; ``press``/``release`` fire the callbacks."""
+
+    def __init__(self):
+        self.handlers: Dict[int, Dict[str, Optional[Callback]]] = {}
+        self.pressed: Dict[int, bool] = {}
+
+    def watch(self, pin: int, on_press: Optional[Callback] = None, on_release: Optional[Callback] = None) -> bool:
+        self.handlers[pin] = {"press": on_press, "release": on_release}
+        return self.pressed.get(pin, False)
+
+    def _fire(self, pin: int, edge: str) -> None:
+        handler = self.handlers.get(pin, {}).get(edge)
+        if handler:
+            handler()
+
+    def press(self, pin: int) -> None:
+        self.pressed[pin] = True
+        self._fire(pin, "press")
+
+    def release(self, pin: int) -> None:
+        self.pressed[pin] = False
+        self._fire(pin, "release")
+
+    def close(self) -> None:
+        self.handlers = {}
+
+
+def default_backend():
+    return GPIOInputBackend() if GPIOButton is not None else MockInputBackend()
+
+
+class InputListener:
+    """Hardware STOP button, glass-present sensor and "pour next" foot pedal.
+
+    Handlers run on the backend's thread and call into PourManager directly, so STOP
+    does not wait for the UI thread. ``on_event`` is told about every input event so
+    the UI can follow along.
+    """
+
+    def __init__(
+        self,
+        pour_manager: PourManager,
+        backend=None,
+        stop_gpio: Optional[int] = None,
+        glass_gpio: Optional[int] = None,
+        pedal_gpio: Optional[int] = None,
+        on_pour_next: Optional[Callback] = None,
+        on_event: Optional[Callable[[str], None]] = None,
+    ):
+        self.pour_manager = pour_manager
+        self.backend = backend or default_backend()
+        self.stop_gpio = stop_gpio
+        self.glass_gpio = glass_gpio
+        self.pedal_gpio = pedal_gpio
+        self.on_pour_next = on_pour_next
+        self.on_event = on_event
+        self.glass_present = glass_gpio is None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, pour_manager: PourManager, config: Dict, **kwargs) -> "InputListener":
+        return cls(
+            pour_manager,
+            stop_gpio=config.get("stop_gpio"),
+            glass_gpio=config.get("glass_gpio"),
+            pedal_gpio=config.get("pedal_gpio"),
+            **kwargs,
+        )
+
+    def start(self) -> None:
+        if self.stop_gpio is not None:
+            self.backend.watch(self.stop_gpio, on_press=self._on_stop)
+        if self.glass_gpio is not None:
+            self.glass_present = self.backend.watch(
+                self.glass_gpio, on_press=self._on_glass_placed, on_release=self._on_glass_removed
+            )
+            self.pour_manager.interlock = self.is_glass_present
+        if self.pedal_gpio is not None:
+            self.backend.watch(self.pedal_gpio, on_press=self._on_pedal)
+
+    def close(self) -> None:
+        if self.pour_manager.interlock == self.is_glass_present:
+            self.pour_manager.interlock = None
+        self.backend.close()
+
+    def is_glass_present(self) -> bool:
+        return self.glass_present
+
+    def _notify(self, event: str) -> None:
+        events.emit(f"input.{event}")
+        if self.on_event:
+            self.on_event(event)
+
+    def _on_stop(self) -> None:
+        self.pour_manager.stop()
+        self._notify("stop")
+
+    def _on_glass_placed(self) -> None:
+        self.glass_present = True
+        self._notify("glass_placed")
+
+    def _on_glass_removed(self) -> None:
+        self.glass_present = False
+        if self.pour_manager.is_running():
+            self.pour_manager.stop()
+        self._notify("glass_removed")
+
+    def _on_pedal(self) -> None:
+        with self._lock:
+            if self.pour_manager.is_running() or not self.glass_present:
+                return
+            if self.on_pour_next:
+                self.on_pour_next()
+        self._notify("pour_next")
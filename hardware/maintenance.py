@@ -0,0 +1,118 @@
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from hardware.pour_manager import PourManager, RunTiming
+from hardware.scheduler import PowerBudgetScheduler, PumpJob, ScheduledRun
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MaintenancePhase:
+    name: str
+    duration_s: float
+
+
+DEFAULT_PHASES = [
+    MaintenancePhase("flush", 20.0),
+    MaintenancePhase("rinse", 15.0),
+    MaintenancePhase("dry", 10.0),
+]
+
+
+class MaintenanceProgram:
+    """Runs every pump through a sequence of cleaning phases.
+
+    Each phase runs all pumps, at most ``concurrency`` at a time and always within
+    the pour scheduler's power budget. ``pause_s`` between phases leaves time to
+    move the inlet tubes to the next container.
+    """
+
+    def __init__(self, phases: List[MaintenancePhase], concurrency: int = 2, pause_s: float = 10.0):
+        self.phases = phases
+        self.concurrency = max(int(concurrency), 1)
+        self.pause_s = pause_s
+        self._pause_before: Dict[int, str] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "MaintenanceProgram":
+        phases = [
+            MaintenancePhase(str(phase["name"]), float(phase["duration_s"]))
+            for phase in config.get("phases", [])
+        ] or list(DEFAULT_PHASES)
+        return cls(phases, concurrency=config.get("concurrency", 2), pause_s=float(config.get("pause_s", 10.0)))
+
+    def plan(self, pumps: List[Dict], budget: PowerBudgetScheduler) -> List[ScheduledRun]:
+        scheduler = PowerBudgetScheduler(
+            max_total_current_a=budget.max_total_current_a,
+            start_stagger_s=budget.start_stagger_s,
+            max_parallel=self.concurrency,
+        )
+        runs: List[ScheduledRun] = []
+        offset = 0.0
+        self._pause_before = {}
+        for phase in self.phases:
+            jobs = [
+                PumpJob(
+                    pump_id=pump["id"],
+                    duration_s=phase.duration_s,
+                    current_a=float(pump.get("current_a", 1.0)),
+                    label=f"{phase.name} pump {pump['id']}",
+                )
+                for pump in pumps
+            ]
+            phase_runs = scheduler.plan(jobs)
+            for run in phase_runs:
+                run.start_s += offset
+                run.step += len(runs)
+            if runs and phase_runs:
+                self._pause_before[min(phase_runs, key=lambda run: run.start_s).step] = phase.name
+            runs.extend(phase_runs)
+            offset = PowerBudgetScheduler.total_duration(runs) + self.pause_s
+        return runs
+
+    def run(
+        self,
+        pour_manager: PourManager,
+        pumps: List[Dict],
+        on_step: Callable[[str, int, int], None],
+        on_done: Callable[[], None],
+        on_stopped: Callable[[], None],
+        on_error: Callable[[str], None],
+        on_pause: Optional[Callable[[str, float], None]] = None,
+    ) -> None:
+        """``on_pause(next_phase, seconds)`` is called when the pumps idle before a new phase."""
+
+        def gap(run: ScheduledRun, wait_s: float) -> None:
+            phase = self._pause_before.get(run.step)
+            if phase is not None and on_pause is not None:
+                on_pause(phase, wait_s)
+
+        def done() -> None:
+            self.log_timings(pour_manager.run_timings)
+            on_done()
+
+        def stopped() -> None:
+            self.log_timings(pour_manager.run_timings)
+            on_stopped()
+
+        pour_manager.run_plan(
+            lambda: self.plan(pumps, pour_manager.scheduler),
+            on_step=on_step,
+            on_done=done,
+            on_stopped=stopped,
+            on_error=on_error,
+            on_gap=gap,
+        )
+
+    @staticmethod
+    def log_timings(timings: List[RunTiming]) -> None:
+        for timing in timings:
+            logger.info(
+                "maintenance %s: planned %.2fs, ran %.2fs",
+                timing.label,
+                timing.planned_s,
+                timing.actual_s,
+            )
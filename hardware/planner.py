@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from core.pumps import PumpStore
+from hardware.pour_manager import PourManager
+from hardware.scheduler import PowerBudgetScheduler, ScheduledRun
+
+
+@dataclass
+class PourPlan:
+    recipe_id: str
+    runs: List[ScheduledRun]
+    timeline_s: float
+    overhead_s: float
+
+    @property
+    def total_s(self) -> float:
+        return self.timeline_s + self.overhead_s
+
+
+class PourPlanner:
+    """Dry-runs a recipe through the pour manager's scheduler without touching the pumps.
+
+    Plans are cached per recipe and dropped whenever ``PumpStore.revision`` changes,
+    i.e. after a pump assignment or calibration update.
+    """
+
+    def __init__(self, pump_store: PumpStore, pour_manager: PourManager):
+        self.pump_store = pump_store
+        self.pour_manager = pour_manager
+        self._cache: Dict[str, Tuple[Dict, PourPlan]] = {}
+        self._revision = pump_store.revision
+
+    def _check_revision(self) -> None:
+        if self._revision != self.pump_store.revision:
+            self._cache = {}
+            self._revision = self.pump_store.revision
+
+    def plan(self, recipe: Dict) -> PourPlan:
+        self._check_revision()
+        recipe_id = recipe.get("id") or ""
+        cached = self._cache.get(recipe_id)
+        if cached is not None and cached[0] is recipe:
+            return cached[1]
+
+        runs = self.pour_manager.plan_recipe(recipe, self.pump_store.ingredient_to_pump())
+        if self.pour_manager.pours_by_weight():
+            # Weight-controlled pours run one pump at a time and let the scale settle after each.
+            timeline_s = sum(run.duration_s for run in runs)
+            overhead_s = self.pour_manager.closed_loop.settle_s * len(runs)
+        else:
+            timeline_s = PowerBudgetScheduler.total_duration(runs)
+            overhead_s = 0.0
+        plan = PourPlan(recipe_id, runs, timeline_s, overhead_s)
+        self._cache[recipe_id] = (recipe, plan)
+        return plan
+
+    def estimate_s(self, recipe: Dict) -> Optional[float]:
+        try:
+            return self.plan(recipe).total_s
+        except RuntimeError:
+            return None
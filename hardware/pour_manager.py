@@ -1,30 +1,157 @@
 import threading
 import time
+from dataclasses import dataclass
 from typing import Callable, Dict, List, Optional
 
+from core import events
 from hardware.pump_driver import PumpDriver
+from hardware.scale import ClosedLoopConfig, ScaleSampler
+from hardware.scheduler import PowerBudgetScheduler, PumpJob, ScheduledRun
+
+
+@dataclass
+class RunTiming:
+    pump_id: int
+    label: str
+    planned_s: float
+    actual_s: float
 
 
 class PourManager:
-    def __init__(self, pump_driver: PumpDriver):
+    def __init__(self, pump_driver: PumpDriver, scheduler: Optional[PowerBudgetScheduler] = None):
         self.pump_driver = pump_driver
+        self.scheduler = scheduler or PowerBudgetScheduler.serial()
         self.stop_event = threading.Event()
         self.thread: Optional[threading.Thread] = None
+        self.run_timings: List[RunTiming] = []
+        self.time_scale = 1.0
+        self.interlock: Optional[Callable[[], bool]] = None
+        self.scale: Optional[ScaleSampler] = None
+        self.closed_loop = ClosedLoopConfig()
+        self.on_calibration: Optional[Callable[[int, float], None]] = None
 
     def is_running(self) -> bool:
         return self.thread is not None and self.thread.is_alive()
 
     def stop(self) -> None:
+        events.emit("pour.stop_requested", running=self.is_running())
         self.stop_event.set()
         self.pump_driver.stop_all()
 
+    def pours_by_weight(self) -> bool:
+        return self.scale is not None and self.scale.is_healthy()
+
     def _sleep_interruptible(self, seconds: float) -> bool:
-        end_time = time.time() + seconds
-        while time.time() < end_time:
-            if self.stop_event.is_set():
+        return not self.stop_event.wait(max(seconds, 0.0))
+
+    def plan_recipe(self, recipe: Dict, ingredient_to_pump: Dict[str, Dict]) -> List[ScheduledRun]:
+        jobs: List[PumpJob] = []
+        for step in recipe.get("steps", []):
+            try:
+                ingredient = step["ingredient"]
+                ml = float(step["ml"])
+            except (KeyError, TypeError, ValueError) as exc:
+                raise RuntimeError(f"Invalid recipe step {step!r}: {exc}") from exc
+            pump = ingredient_to_pump.get(ingredient)
+            if not pump:
+                raise RuntimeError(f"Ingredient '{ingredient}' is not assigned to a pump")
+
+            ml_per_sec = float(pump.get("ml_per_sec", 0))
+            if ml_per_sec <= 0:
+                raise RuntimeError(f"Invalid ml_per_sec for pump {pump['id']}")
+
+            jobs.append(
+                PumpJob(
+                    pump_id=pump["id"],
+                    duration_s=ml / ml_per_sec,
+                    current_a=float(pump.get("current_a", 1.0)),
+                    label=ingredient,
+                    amount_ml=ml,
+                )
+            )
+        return self.scheduler.plan(jobs)
+
+    def _record_timing(self, run: ScheduledRun, actual_s: float) -> None:
+        self.run_timings.append(RunTiming(run.pump_id, run.label, run.duration_s, actual_s))
+        events.emit("pour.run_finished", label=run.label, pump_id=run.pump_id, planned_s=run.duration_s, actual_s=actual_s)
+
+    def _execute(
+        self,
+        runs: List[ScheduledRun],
+        on_step: Callable[[str, int, int], None],
+        on_gap: Optional[Callable[[ScheduledRun, float], None]] = None,
+    ) -> bool:
+        timeline = []
+        for run in runs:
+            timeline.append((run.start_s, 1, run))
+            timeline.append((run.end_s, 0, run))
+        timeline.sort(key=lambda event: (event[0], event[1]))
+
+        total = len(runs)
+        started = 0
+        started_at: Dict[int, float] = {}
+        self.run_timings = []
+        t0 = time.monotonic()
+        for at, is_start, run in timeline:
+            wait_s = t0 + at * self.time_scale - time.monotonic()
+            if is_start and not started_at and wait_s > 0 and on_gap is not None:
+                # No pump is running until the next start: tell the caller what it is waiting for.
+                on_gap(run, wait_s)
+            if not self._sleep_interruptible(wait_s):
                 return False
-            time.sleep(0.05)
-        return True
+            if is_start:
+                if self.interlock is not None and not self.interlock():
+                    raise RuntimeError("No glass detected under the nozzle")
+                started += 1
+                on_step(run.label, started, total)
+                events.emit("pour.step", label=run.label, pump_id=run.pump_id, step=started, total=total)
+                self.pump_driver.start(run.pump_id, exclusive=False)
+                started_at[id(run)] = time.monotonic()
+            else:
+                self.pump_driver.stop(run.pump_id)
+                self._record_timing(run, time.monotonic() - started_at.pop(id(run)))
+        return not self.stop_event.is_set()
+
+    def _execute_by_weight(self, runs: List[ScheduledRun], on_step: Callable[[str, int, int], None]) -> bool:
+        # One scale cannot tell pumps apart, so weight-controlled runs are always serial.
+        config = self.closed_loop
+        total = len(runs)
+        self.run_timings = []
+        for idx, run in enumerate(sorted(runs, key=lambda item: item.step), start=1):
+            if self.interlock is not None and not self.interlock():
+                raise RuntimeError("No glass detected under the nozzle")
+            baseline = self.scale.latest()
+            target_g = run.amount_ml * config.density_g_per_ml
+            timeout = run.duration_s * config.timeout_factor + 1.0
+
+            on_step(run.label, idx, total)
+            events.emit("pour.step", label=run.label, pump_id=run.pump_id, step=idx, total=total, target_g=target_g)
+            self.pump_driver.start(run.pump_id, exclusive=False)
+            started_at = time.monotonic()
+            while True:
+                if not self._sleep_interruptible(self.scale.period_s):
+                    return False
+                if not self.scale.is_healthy():
+                    self.pump_driver.stop(run.pump_id)
+                    raise RuntimeError("Scale stopped responding")
+                poured = self.scale.latest() - baseline
+                if poured + self.scale.flow_g_per_s() * config.cutoff_lag_s >= target_g:
+                    break
+                if time.monotonic() - started_at > timeout:
+                    self.pump_driver.stop(run.pump_id)
+                    raise RuntimeError(
+                        f"Pump {run.pump_id} poured {poured:.0f} g of {target_g:.0f} g before timing out"
+                    )
+            self.pump_driver.stop(run.pump_id)
+            actual = time.monotonic() - started_at
+            self._record_timing(run, actual)
+
+            if not self._sleep_interruptible(config.settle_s):
+                return False
+            measured_ml = (self.scale.latest() - baseline) / config.density_g_per_ml
+            if self.on_calibration is not None and measured_ml > 0 and actual > 0:
+                self.on_calibration(run.pump_id, measured_ml / actual)
+        return not self.stop_event.is_set()
 
     def run_recipe(
         self,
@@ -34,6 +161,26 @@ class PourManager:
         on_done: Callable[[], None],
         on_stopped: Callable[[], None],
         on_error: Callable[[str], None],
+        runs: Optional[List[ScheduledRun]] = None,
+    ) -> None:
+        self.run_plan(
+            lambda: runs if runs is not None else self.plan_recipe(recipe, ingredient_to_pump),
+            on_step=on_step,
+            on_done=on_done,
+            on_stopped=on_stopped,
+            on_error=on_error,
+            by_weight=self.pours_by_weight(),
+        )
+
+    def run_plan(
+        self,
+        plan: Callable[[], List[ScheduledRun]],
+        on_step: Callable[[str, int, int], None],
+        on_done: Callable[[], None],
+        on_stopped: Callable[[], None],
+        on_error: Callable[[str], None],
+        by_weight: bool = False,
+        on_gap: Optional[Callable[[ScheduledRun, float], None]] = None,
     ) -> None:
         if self.is_running():
             return
@@ -41,41 +188,27 @@ class PourManager:
         self.stop_event.clear()
 
         def worker() -> None:
+            started_at = time.monotonic()
             try:
-                steps: List[Dict] = recipe.get("steps", [])
-                total = len(steps)
-                for idx, step in enumerate(steps, start=1):
-                    if self.stop_event.is_set():
-                        self.pump_driver.stop_all()
-                        on_stopped()
-                        return
-
-                    ingredient = step["ingredient"]
-                    ml = float(step["ml"])
-                    pump = ingredient_to_pump.get(ingredient)
-                    if not pump:
-                        raise RuntimeError(f"Ingredient '{ingredient}' is not assigned to a pump")
-
-                    ml_per_sec = float(pump.get("ml_per_sec", 0))
-                    if ml_per_sec <= 0:
-                        raise RuntimeError(f"Invalid ml_per_sec for pump {pump['id']}")
-
-                    duration = ml / ml_per_sec
-                    on_step(ingredient, idx, total)
-                    self.pump_driver.start(pump["id"])
-                    completed = self._sleep_interruptible(duration)
-                    self.pump_driver.stop(pump["id"])
-
-                    if not completed or self.stop_event.is_set():
-                        self.pump_driver.stop_all()
-                        on_stopped()
-                        return
+                runs = plan()
+                events.emit("pour.started", runs=len(runs), by_weight=by_weight)
+                if by_weight:
+                    completed = not self.stop_event.is_set() and self._execute_by_weight(runs, on_step)
+                else:
+                    completed = not self.stop_event.is_set() and self._execute(runs, on_step, on_gap)
+                if not completed:
+                    self.pump_driver.stop_all()
+                    events.emit("pour.stopped", elapsed_s=time.monotonic() - started_at)
+                    on_stopped()
+                    return
 
                 self.pump_driver.stop_all()
+                events.emit("pour.done", elapsed_s=time.monotonic() - started_at)
                 on_done()
             except Exception as exc:
                 self.pump_driver.stop_all()
+                events.emit("pour.error", error=str(exc), elapsed_s=time.monotonic() - started_at)
                 on_error(str(exc))
 
-        self.thread = threading.Thread(target=worker, daemon=True)
+        self.thread = threading.Thread(target=worker, name="pour-worker", daemon=True)
         self.thread.start()
@@ -1,5 +1,7 @@
 from typing import Dict
 
+from core import events
+
 try:
     from gpiozero import OutputDevice
 except Exception:  # pragma: no cover - dev fallback on non-RPi machines
@@ -26,18 +28,22 @@ class PumpDriver:
         }
         self.stop_all()
 
-    def start(self, pump_id: int) -> None:
-        self.stop_all()
+    def start(self, pump_id: int, exclusive: bool = True) -> None:
+        if exclusive:
+            self.stop_all()
         device = self.devices[pump_id]
         device.on()  # high = ON
+        events.emit("pump.start", pump_id=pump_id, exclusive=exclusive)
 
     def stop(self, pump_id: int) -> None:
         device = self.devices[pump_id]
         device.off()  # low = OFF
+        events.emit("pump.stop", pump_id=pump_id)
 
     def stop_all(self) -> None:
         for device in self.devices.values():
             device.off()
+        events.emit("pump.stop_all")
 
     def close(self) -> None:
         self.stop_all()
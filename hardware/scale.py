@@ -0,0 +1,141 @@
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+
+from hardware.sim_driver import SimulatedPumpDriver
+
+try:
+    from hx711 import HX711
+except Exception:  # pragma: no cover - dev fallback on non-RPi machines
+    HX711 = None
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClosedLoopConfig:
+    sample_hz: float = 20.0
+    density_g_per_ml: float = 1.0
+    cutoff_lag_s: float = 0.3
+    settle_s: float = 0.5
+    timeout_factor: float = 2.0
+    learn_weight: float = 0.3
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "ClosedLoopConfig":
+        fields = cls.__dataclass_fields__
+        return cls(**{key: float(value) for key, value in config.items() if key in fields})
+
+
+class HX711Scale:
+    """Wrapper for the gandalf15 HX711 library (see README for the pinned install)."""
+
+    def __init__(self, dout_gpio: int, sck_gpio: int, scale_ratio: float = 1.0, readings: int = 3):
+        if HX711 is None:
+            raise RuntimeError("hx711 package is not installed")
+        self.readings = readings
+        self.device = HX711(dout_pin=dout_gpio, pd_sck_pin=sck_gpio)
+        # zero() returns False on success.
+        if self.device.zero():
+            raise RuntimeError("HX711 tare failed")
+        self.device.set_scale_ratio(scale_ratio)
+
+    def read_grams(self) -> float:
+        weight = self.device.get_weight_mean(self.readings)
+        if weight is False:
+            raise RuntimeError("HX711 returned invalid data")
+        return float(weight)
+
+    def close(self) -> None:
+        self.device.power_down()
+
+
+class SimulatedScale:
+    """Weighs what a SimulatedPumpDriver has dispensed, minus the liquid still in the tubes."""
+
+    def __init__(
+        self,
+        driver: SimulatedPumpDriver,
+        ml_per_sec: Dict[int, float],
+        density_g_per_ml: float = 1.0,
+        tube_lag_s: float = 0.2,
+    ):
+        self.driver = driver
+        self.ml_per_sec = ml_per_sec
+        self.density_g_per_ml = density_g_per_ml
+        self.tube_lag_s = tube_lag_s
+
+    def read_grams(self) -> float:
+        now = self.driver.clock()
+        in_flight = sum(
+            self.ml_per_sec.get(pump_id, 0.0) * min(self.tube_lag_s, now - started_at)
+            for pump_id, started_at in self.driver.running.items()
+        )
+        dispensed = sum(self.driver.dispensed_ml(self.ml_per_sec).values())
+        return max(dispensed - in_flight, 0.0) * self.density_g_per_ml
+
+    def close(self) -> None:
+        pass
+
+
+class ScaleSampler:
+    """Reads the scale at a fixed rate on its own thread and keeps a short history."""
+
+    def __init__(self, scale, sample_hz: float = 20.0, history: int = 32):
+        self.scale = scale
+        self.period_s = 1.0 / sample_hz
+        self.stale_after_s = max(self.period_s * 10, 1.0)
+        self.samples: Deque[Tuple[float, float]] = deque(maxlen=history)
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.scale.close()
+
+    def _run(self) -> None:
+        next_at = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                grams = self.scale.read_grams()
+            except Exception as exc:
+                self.errors += 1
+                if self.errors == 1 or self.errors % 100 == 0:
+                    logger.warning("Scale read failed (%d errors so far): %s", self.errors, exc)
+            else:
+                with self._lock:
+                    self.samples.append((time.monotonic(), grams))
+            next_at += self.period_s
+            self._stop.wait(max(next_at - time.monotonic(), 0.0))
+
+    def is_healthy(self) -> bool:
+        with self._lock:
+            last_at = self.samples[-1][0] if self.samples else None
+        return last_at is not None and time.monotonic() - last_at <= self.stale_after_s
+
+    def latest(self) -> float:
+        with self._lock:
+            return self.samples[-1][1] if self.samples else 0.0
+
+    def flow_g_per_s(self, window: int = 5) -> float:
+        with self._lock:
+            recent = list(self.samples)[-window:]
+        if len(recent) < 2 or recent[-1][0] <= recent[0][0]:
+            return 0.0
+        return max((recent[-1][1] - recent[0][1]) / (recent[-1][0] - recent[0][0]), 0.0)
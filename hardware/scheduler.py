@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class PumpJob:
+    pump_id: int
+    duration_s: float
+    current_a: float = 1.0
+    label: str = ""
+    amount_ml: float = 0.0
+
+
+@dataclass
+class ScheduledRun:
+    pump_id: int
+    start_s: float
+    duration_s: float
+    current_a: float
+    label: str = ""
+    step: int = 0
+    amount_ml: float = 0.0
+
+    @property
+    def end_s(self) -> float:
+        return self.start_s + self.duration_s
+
+
+class PowerBudgetScheduler:
+    """Packs pump runs into a timeline that never exceeds the PSU current budget.
+
+    Jobs start strictly in the given order: a job that does not fit waits for
+    current to free up, and later jobs wait behind it (recipe step order matters
+    for layered drinks). A pump never runs twice at once, and consecutive starts
+    are at least ``start_stagger_s`` apart so inrush peaks do not overlap.
+    """
+
+    def __init__(
+        self,
+        max_total_current_a: float = 0.0,
+        start_stagger_s: float = 0.0,
+        max_parallel: Optional[int] = None,
+    ):
+        self.max_total_current_a = max_total_current_a
+        self.start_stagger_s = start_stagger_s
+        self.max_parallel = max_parallel
+
+    @classmethod
+    def serial(cls) -> "PowerBudgetScheduler":
+        return cls(max_total_current_a=0.0, start_stagger_s=0.0, max_parallel=1)
+
+    def _fits(self, job: PumpJob, active: List[ScheduledRun]) -> bool:
+        if not active:
+            return True
+        if self.max_parallel is not None and len(active) >= self.max_parallel:
+            return False
+        if any(run.pump_id == job.pump_id for run in active):
+            return False
+        used = sum(run.current_a for run in active)
+        return used + job.current_a <= self.max_total_current_a + 1e-9
+
+    def plan(self, jobs: List[PumpJob]) -> List[ScheduledRun]:
+        pending = list(enumerate(jobs, start=1))
+        active: List[ScheduledRun] = []
+        runs: List[ScheduledRun] = []
+        now = 0.0
+        last_start: Optional[float] = None
+
+        while pending:
+            for entry in list(pending):
+                step, job = entry
+                if not self._fits(job, active):
+                    break
+                start = now if last_start is None else max(now, last_start + self.start_stagger_s)
+                run = ScheduledRun(job.pump_id, start, job.duration_s, job.current_a, job.label, step, job.amount_ml)
+                active.append(run)
+                runs.append(run)
+                pending.remove(entry)
+                last_start = start
+
+            if pending:
+                now = min(run.end_s for run in active)
+                active = [run for run in active if run.end_s > now]
+
+        runs.sort(key=lambda run: (run.start_s, run.step))
+        return runs
+
+    @staticmethod
+    def total_duration(runs: List[ScheduledRun]) -> float:
+        return max((run.end_s for run in runs), default=0.0)
@@ -0,0 +1,48 @@
+import time
+from typing import Callable, Dict, Iterable
+
+
+class SimulatedPumpDriver:
+    """Drop-in PumpDriver replacement that only tracks pump run time.
+
+    ``clock`` can be swapped for a virtual clock so replays run faster than real time.
+    """
+
+    def __init__(self, pump_ids: Iterable[int], clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.pump_ids = list(pump_ids)
+        self.running: Dict[int, float] = {}
+        self.runtime_s: Dict[int, float] = {pump_id: 0.0 for pump_id in self.pump_ids}
+        self.transitions = 0
+
+    def start(self, pump_id: int, exclusive: bool = True) -> None:
+        if pump_id not in self.runtime_s:
+            raise KeyError(pump_id)
+        if exclusive:
+            self.stop_all()
+        if pump_id in self.running:
+            return
+        self.running[pump_id] = self.clock()
+        self.transitions += 1
+
+    def stop(self, pump_id: int) -> None:
+        started_at = self.running.pop(pump_id, None)
+        if started_at is not None:
+            self.runtime_s[pump_id] += self.clock() - started_at
+            self.transitions += 1
+
+    def stop_all(self) -> None:
+        for pump_id in list(self.running):
+            self.stop(pump_id)
+
+    def close(self) -> None:
+        self.stop_all()
+
+    def dispensed_ml(self, ml_per_sec: Dict[int, float]) -> Dict[int, float]:
+        now = self.clock()
+        dispensed: Dict[int, float] = {}
+        for pump_id, runtime in self.runtime_s.items():
+            if pump_id in self.running:
+                runtime += now - self.running[pump_id]
+            dispensed[pump_id] = runtime * ml_per_sec.get(pump_id, 0.0)
+        return dispensed
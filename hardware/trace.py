@@ -0,0 +1,252 @@
+"""Binary pour-session traces: recording, replay and regression checks.
+
+File layout (little endian)::
+
+    b"CBTR" | version:u8 | meta_len:u32 | meta (JSON, utf-8) | records...
+
+Each record is ``delta_us:u32 | op:u8 | pump_id:u8`` where ``delta_us`` is the
+monotonic time since the session started.
+"""
+
+import json
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from hardware.sim_driver import SimulatedPumpDriver
+
+
+MAGIC = b"CBTR"
+VERSION = 1
+HEADER = struct.Struct("<4sBI")
+RECORD = struct.Struct("<IBB")
+
+OP_START = 1
+OP_STOP = 2
+OP_STOP_ALL = 3
+OP_START_SHARED = 4
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+TRACES_DIR = DATA_DIR / "traces"
+MAX_TRACE_FILES = 500
+
+
+@dataclass
+class Trace:
+    meta: Dict
+    events: List[Tuple[float, int, int]] = field(default_factory=list)
+
+
+@dataclass
+class ReplayResult:
+    volumes_ml: Dict[int, float]
+    duration_s: float
+    failures: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+def encode_trace(meta: Dict, records: bytes) -> bytes:
+    meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(MAGIC, VERSION, len(meta_bytes)) + meta_bytes + records
+
+
+def load_trace(path: Path) -> Trace:
+    payload = Path(path).read_bytes()
+    magic, version, meta_len = HEADER.unpack_from(payload, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} pour trace")
+    offset = HEADER.size
+    meta = json.loads(payload[offset:offset + meta_len].decode("utf-8"))
+    offset += meta_len
+    events = [
+        (delta_us / 1_000_000, op, pump_id)
+        for delta_us, op, pump_id in RECORD.iter_unpack(payload[offset:])
+    ]
+    return Trace(meta=meta, events=events)
+
+
+class TraceRecorder:
+    """Wraps a pump driver and records every transition of the current session."""
+
+    def __init__(self, driver, trace_dir: Path = TRACES_DIR, max_files: int = MAX_TRACE_FILES):
+        self.driver = driver
+        self.trace_dir = trace_dir
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._records: Optional[bytearray] = None
+        self._meta: Dict = {}
+        self._started_ns = 0
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+    def begin_session(
+        self,
+        recipe: Dict,
+        ingredient_to_pump: Dict[str, Dict],
+        expected_duration_s: Optional[float] = None,
+        mode: str = "timed",
+    ) -> None:
+        """Start recording a pour. ``mode`` is "timed" or "weight" (scale-controlled)."""
+        expected_ml: Dict[str, float] = {}
+        serial_duration_s = 0.0
+        for step in recipe.get("steps", []):
+            # Malformed steps are the pour worker's error to report; recording must not block the pour.
+            try:
+                pump = ingredient_to_pump.get(step.get("ingredient"))
+                ml = float(step["ml"])
+            except (AttributeError, KeyError, TypeError, ValueError):
+                continue
+            if pump:
+                key = str(pump["id"])
+                expected_ml[key] = expected_ml.get(key, 0.0) + ml
+                ml_per_sec = float(pump.get("ml_per_sec", 0))
+                if ml_per_sec > 0:
+                    serial_duration_s += ml / ml_per_sec
+        if expected_duration_s is None:
+            expected_duration_s = serial_duration_s
+        with self._lock:
+            self._meta = {
+                "recipe_id": recipe.get("id"),
+                "mode": mode,
+                "started_at": time.time(),
+                "ml_per_sec": {
+                    str(pump["id"]): float(pump.get("ml_per_sec", 0)) for pump in ingredient_to_pump.values()
+                },
+                "expected_ml": expected_ml,
+                "expected_duration_s": expected_duration_s,
+            }
+            self._records = bytearray()
+            self._started_ns = time.monotonic_ns()
+
+    def end_session(self, outcome: str) -> Optional[Path]:
+        with self._lock:
+            records, self._records = self._records, None
+            meta = dict(self._meta, outcome=outcome)
+        if records is None:
+            return None
+
+        self.trace_dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(meta["started_at"]))
+        path = self.trace_dir / f"{stamp}_{meta.get('recipe_id') or 'session'}.cbtrace"
+        path.write_bytes(encode_trace(meta, bytes(records)))
+        self._prune()
+        return path
+
+    def _prune(self) -> None:
+        traces = sorted(self.trace_dir.glob("*.cbtrace"))
+        for old in traces[:-self.max_files]:
+            old.unlink(missing_ok=True)
+
+    def _record(self, op: int, pump_id: int) -> None:
+        with self._lock:
+            if self._records is None:
+                return
+            delta_us = (time.monotonic_ns() - self._started_ns) // 1000
+            self._records += RECORD.pack(min(delta_us, 0xFFFFFFFF), op, pump_id)
+
+    def start(self, pump_id: int, exclusive: bool = True) -> None:
+        self.driver.start(pump_id, exclusive=exclusive)
+        self._record(OP_START if exclusive else OP_START_SHARED, pump_id)
+
+    def stop(self, pump_id: int) -> None:
+        self.driver.stop(pump_id)
+        self._record(OP_STOP, pump_id)
+
+    def stop_all(self) -> None:
+        self.driver.stop_all()
+        self._record(OP_STOP_ALL, 0)
+
+    def close(self) -> None:
+        self.driver.close()
+
+
+class _VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def replay(trace: Trace, tolerance_ml: float = 2.0, tolerance_s: float = 0.25) -> ReplayResult:
+    ml_per_sec = {int(pump_id): rate for pump_id, rate in trace.meta.get("ml_per_sec", {}).items()}
+    pump_ids = set(ml_per_sec) | {pump_id for _, op, pump_id in trace.events if op != OP_STOP_ALL}
+    clock = _VirtualClock()
+    driver = SimulatedPumpDriver(sorted(pump_ids), clock=clock)
+
+    for timestamp, op, pump_id in trace.events:
+        clock.now = timestamp
+        if op == OP_START:
+            driver.start(pump_id)
+        elif op == OP_START_SHARED:
+            driver.start(pump_id, exclusive=False)
+        elif op == OP_STOP:
+            driver.stop(pump_id)
+        elif op == OP_STOP_ALL:
+            driver.stop_all()
+    driver.stop_all()
+
+    result = ReplayResult(
+        volumes_ml={pump_id: ml for pump_id, ml in driver.dispensed_ml(ml_per_sec).items() if ml > 0},
+        duration_s=clock.now,
+    )
+    if trace.meta.get("outcome") != "done":
+        return result
+
+    expected_ml = {int(pump_id): ml for pump_id, ml in trace.meta.get("expected_ml", {}).items()}
+    if trace.meta.get("mode") == "weight":
+        # Weight pours stop on the scale, so run time tracks the real flow rather than the recorded
+        # ml_per_sec; only check that every expected pump ran.
+        for pump_id in sorted(expected_ml):
+            if pump_id not in result.volumes_ml:
+                result.failures.append(f"pump {pump_id}: never ran, expected {expected_ml[pump_id]:.1f} ml")
+        return result
+
+    for pump_id in sorted(set(expected_ml) | set(result.volumes_ml)):
+        actual = result.volumes_ml.get(pump_id, 0.0)
+        expected = expected_ml.get(pump_id, 0.0)
+        if abs(actual - expected) > tolerance_ml:
+            result.failures.append(f"pump {pump_id}: dispensed {actual:.1f} ml, expected {expected:.1f} ml")
+
+    expected_duration = trace.meta.get("expected_duration_s")
+    if expected_duration is not None and result.duration_s - expected_duration > tolerance_s:
+        result.failures.append(
+            f"duration {result.duration_s:.2f}s exceeds expected {expected_duration:.2f}s by more than {tolerance_s}s"
+        )
+    return result
+
+
+def run_corpus(corpus_dir: Path, tolerance_ml: float = 2.0, tolerance_s: float = 0.25) -> Dict[Path, ReplayResult]:
+    return {
+        path: replay(load_trace(path), tolerance_ml=tolerance_ml, tolerance_s=tolerance_s)
+        for path in sorted(Path(corpus_dir).glob("*.cbtrace"))
+    }
+
+
+def main(argv: List[str]) -> int:
+    corpus_dir = Path(argv[0]) if argv else TRACES_DIR
+    started = time.perf_counter()
+    results = run_corpus(corpus_dir)
+    elapsed = time.perf_counter() - started
+
+    failed = 0
+    for path, result in results.items():
+        status = "ok" if result.ok else "FAIL"
+        print(f"{status:4} {path.name}: {result.duration_s:.2f}s")
+        for failure in result.failures:
+            print(f"       {failure}")
+        failed += not result.ok
+    print(f"{len(results)} traces replayed in {elapsed * 1000:.1f} ms, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
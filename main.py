@@ -1,6 +1,13 @@
 import atexit
 import configparser
+import logging
+import os
 import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
 from pathlib import Path
 
 
@@ -43,20 +50,41 @@ Config.set("graphics", "fullscreen", "1")
 
 from kivymd.app import MDApp
 from kivy.clock import Clock
-from kivy.lang import Builder
 from kivy.resources import resource_add_path
-from kivy.uix.button import Button
-from kivy.uix.popup import Popup
 from kivy.uix.screenmanager import ScreenManager
 
-from app.screens import AssignPumpScreen, CalibrationScreen, DoneScreen, HomeScreen, PouringScreen, SettingsScreen
+from app.dialogs import Dialogs
+from app.memory import MemoryProbe, SoakTest
+from app.profiler import FrameTimer, SamplingProfiler
+from app.screens import (
+    AssignPumpScreen,
+    CalibrationScreen,
+    DashboardScreen,
+    DoneScreen,
+    HomeScreen,
+    PouringScreen,
+    SettingsScreen,
+)
+from app.ui_build import UIBuilder
+from core import events
 from core.pumps import PumpStore
 from core.recipes import RecipeStore
+from hardware.inputs import InputListener
+from hardware.maintenance import MaintenanceProgram
+from hardware.planner import PourPlanner
 from hardware.pour_manager import PourManager
 from hardware.pump_driver import PumpDriver
+from hardware.scale import ClosedLoopConfig, HX711Scale, ScaleSampler, SimulatedScale
+from hardware.scheduler import PowerBudgetScheduler
+from hardware.sim_driver import SimulatedPumpDriver
+from hardware.trace import TraceRecorder
 
 
 BASE_DIR = Path(__file__).resolve().parent
+logger = logging.getLogger(__name__)
+# Memory instrumentation: sample every N seconds, or run N soak cycles against the simulated driver.
+MEMPROBE_INTERVAL_S = float(os.environ.get("COCKTAILBOT_MEMPROBE_INTERVAL", "0"))
+SOAK_CYCLES = int(os.environ.get("COCKTAILBOT_SOAK_CYCLES", "0"))
 
 
 class CocktailBotApp(MDApp):
@@ -65,26 +93,99 @@ class CocktailBotApp(MDApp):
         self.base_dir = BASE_DIR
         resource_add_path(str(self.base_dir))
         resource_add_path(str(self.base_dir / "assets"))
+        events.configure()
+        events.emit("app.start")
         self.recipe_store = RecipeStore()
         self.pump_store = PumpStore()
-        self.pump_driver = PumpDriver(self.pump_store.pump_id_to_gpio())
-        self.pour_manager = PourManager(self.pump_driver)
+        if SOAK_CYCLES:
+            self.pump_driver = TraceRecorder(
+                SimulatedPumpDriver(self.pump_store.pump_id_to_gpio()),
+                trace_dir=Path(tempfile.mkdtemp(prefix="cocktailbot-soak-")),
+            )
+        else:
+            self.pump_driver = TraceRecorder(PumpDriver(self.pump_store.pump_id_to_gpio()))
+        self.pour_manager = PourManager(self.pump_driver, PowerBudgetScheduler(**self.pump_store.power_budget()))
+        self.pour_planner = PourPlanner(self.pump_store, self.pour_manager)
+        self._pour_lock = threading.Lock()
+        self.soak_test = None
+        self.profiler = SamplingProfiler()
+        self.frame_timer = FrameTimer()
+        self.completed_pours = deque(maxlen=500)
+        self.scale_sampler = None
+        scale_config = self.pump_store.scale_config()
+        # Soak runs pour by time: weight pours ignore time_scale and would save learned rates to pumps.json.
+        if scale_config.get("enabled") and not SOAK_CYCLES:
+            self.start_scale(scale_config)
+        self.input_listener = None
+        if not SOAK_CYCLES:
+            self.input_listener = InputListener.from_config(
+                self.pour_manager,
+                self.pump_store.inputs_config(),
+                on_pour_next=self.pour_next_from_input,
+                on_event=self._on_input_event,
+            )
 
         atexit.register(self.safe_shutdown)
         self.prevent_screen_sleep()
 
-        Builder.load_file(str(self.base_dir / "app" / "app.kv"))
+        self.ui = UIBuilder(self.base_dir / "app" / "app.kv")
+        self.ui.load_kv()
+        self.dialogs = Dialogs()
 
         self.sm = ScreenManager()
         self.sm.app = self
-        self.sm.add_widget(HomeScreen(name="home"))
-        self.sm.add_widget(SettingsScreen(name="settings"))
-        self.sm.add_widget(AssignPumpScreen(name="assign_pump"))
-        self.sm.add_widget(CalibrationScreen(name="calibration"))
-        self.sm.add_widget(PouringScreen(name="pouring"))
-        self.sm.add_widget(DoneScreen(name="done"))
+        self.sm.add_widget(self.ui.build_screen(HomeScreen, "home"))
+        self.sm.add_widget(self.ui.build_screen(SettingsScreen, "settings"))
+        self.sm.add_widget(self.ui.build_screen(AssignPumpScreen, "assign_pump"))
+        self.sm.add_widget(self.ui.build_screen(CalibrationScreen, "calibration"))
+        self.sm.add_widget(self.ui.build_screen(PouringScreen, "pouring"))
+        self.sm.add_widget(self.ui.build_screen(DoneScreen, "done"))
+        self.sm.add_widget(self.ui.build_screen(DashboardScreen, "dashboard"))
         return self.sm
 
+    def on_start(self):
+        if self.input_listener is not None:
+            self.input_listener.start()
+        if SOAK_CYCLES:
+            self.soak_test = SoakTest(self, SOAK_CYCLES)
+            self.soak_test.start()
+        elif MEMPROBE_INTERVAL_S > 0:
+            self.memory_probe = MemoryProbe()
+            self.memory_probe.start()
+            self.memory_probe.log_every(self.sm, MEMPROBE_INTERVAL_S)
+
+    def toggle_profiler(self):
+        if self.profiler.running:
+            self.profiler.stop()
+            self.frame_timer.stop()
+        else:
+            self.profiler.start()
+            self.frame_timer.start()
+
+    def drinks_per_hour(self) -> float:
+        cutoff = time.monotonic() - 3600
+        return float(sum(1 for finished_at in self.completed_pours if finished_at >= cutoff))
+
+    def start_scale(self, config):
+        closed_loop = ClosedLoopConfig.from_config(config)
+        if isinstance(self.pump_driver.driver, SimulatedPumpDriver):
+            rates = {pump["id"]: float(pump.get("ml_per_sec", 0)) for pump in self.pump_store.pumps}
+            scale = SimulatedScale(self.pump_driver.driver, rates, closed_loop.density_g_per_ml)
+        else:
+            try:
+                scale = HX711Scale(config["dout_gpio"], config["sck_gpio"], float(config.get("scale_ratio", 1.0)))
+            except Exception as exc:
+                logger.warning("Scale disabled, falling back to time-based pours: %s", exc)
+                return
+
+        self.scale_sampler = ScaleSampler(scale, closed_loop.sample_hz)
+        self.scale_sampler.start()
+        self.pour_manager.scale = self.scale_sampler
+        self.pour_manager.closed_loop = closed_loop
+        self.pour_manager.on_calibration = lambda pump_id, ml_per_sec: Clock.schedule_once(
+            lambda *_: self.pump_store.refine_ml_per_sec(pump_id, ml_per_sec, closed_loop.learn_weight)
+        )
+
     def prevent_screen_sleep(self):
         commands = [
             ["xset", "s", "off"],
@@ -122,12 +223,40 @@ class CocktailBotApp(MDApp):
         self.sm.current = "calibration"
 
     def start_pour(self, recipe):
+        self._run_pour(recipe, self._show_pouring)
+
+    def _show_pouring(self):
         self.sm.current = "pouring"
         pouring = self.sm.get_screen("pouring")
         pouring.status_text = "Starting..."
         pouring.progress_text = "0/0"
-
+        pouring.remaining_text = ""
+        pouring.progress = 0
+
+    def _run_pour(self, recipe, show_pouring):
+        # The UI and the pedal thread can both get here; only the first may touch the session or screen.
+        with self._pour_lock:
+            if self.pour_manager.is_running():
+                return
+            show_pouring()
+            self._start_pour_locked(recipe)
+
+    def _start_pour_locked(self, recipe):
+        pouring = self.sm.get_screen("pouring")
         ingredient_map = self.pump_store.ingredient_to_pump()
+        try:
+            plan = self.pour_planner.plan(recipe)
+        except RuntimeError:
+            plan = None
+        self.pump_driver.begin_session(
+            recipe,
+            ingredient_map,
+            plan.total_s if plan else None,
+            mode="weight" if self.pour_manager.pours_by_weight() else "timed",
+        )
+        if plan is not None:
+            total_s = plan.total_s * (1.0 if self.pour_manager.pours_by_weight() else self.pour_manager.time_scale)
+            Clock.schedule_once(lambda *_: pouring.start_countdown(total_s))
 
         self.pour_manager.run_recipe(
             recipe=recipe,
@@ -135,25 +264,91 @@ class CocktailBotApp(MDApp):
             on_step=lambda ingredient, step, total: Clock.schedule_once(
                 lambda *_: pouring.set_step(ingredient, step, total)
             ),
-            on_done=lambda: Clock.schedule_once(lambda *_: self._go_done()),
-            on_stopped=lambda: Clock.schedule_once(lambda *_: setattr(pouring, "status_text", "Stopped")),
-            on_error=lambda err: Clock.schedule_once(lambda *_: self.show_error(f"Pour error: {err}")),
+            on_done=lambda: Clock.schedule_once(lambda *_: self._finish_pour("done")),
+            on_stopped=lambda: Clock.schedule_once(lambda *_: self._finish_pour("stopped")),
+            on_error=lambda err: Clock.schedule_once(lambda *_: self._finish_pour("error", err)),
+            runs=plan.runs if plan else None,
         )
 
+    def pour_next_from_input(self):
+        # Runs on the input listener thread: start the pumps here, switch screens on the UI thread.
+        if self.sm.current not in ("home", "done"):
+            return
+        home = self.sm.get_screen("home")
+        if not home.selected_recipe_id or not home.selected_available:
+            return
+        recipe = self.recipe_store.get_recipe_by_id(home.selected_recipe_id)
+        self._run_pour(recipe, lambda: Clock.schedule_once(lambda *_: self._show_pouring()))
+
+    def _on_input_event(self, event: str):
+        if event in ("stop", "glass_removed"):
+            Clock.schedule_once(lambda *_: self._show_input_stop())
+
+    def _show_input_stop(self):
+        if self.sm.current == "pouring":
+            self.dialogs.show_stopped()
+
+    def _finish_pour(self, outcome: str, error: str = ""):
+        try:
+            self.pump_driver.end_session(outcome)
+        except OSError:
+            pass
+        self.sm.get_screen("pouring").stop_countdown(finished=outcome == "done")
+        if outcome == "done":
+            self.completed_pours.append(time.monotonic())
+            self._go_done()
+        elif outcome == "stopped":
+            self.sm.get_screen("pouring").status_text = "Stopped"
+        else:
+            self.show_error(f"Pour error: {error}")
+
+    def start_cleaning(self):
+        if self.pour_manager.is_running():
+            return
+        self._show_pouring()
+        pouring = self.sm.get_screen("pouring")
+        pouring.status_text = "Cleaning: starting..."
+
+        program = MaintenanceProgram.from_config(self.pump_store.maintenance_config())
+        pumps = list(self.pump_store.pumps)
+        total_s = PowerBudgetScheduler.total_duration(program.plan(pumps, self.pour_manager.scheduler))
+        pouring.start_countdown(total_s * self.pour_manager.time_scale)
+        program.run(
+            self.pour_manager,
+            pumps,
+            on_step=lambda label, step, total: Clock.schedule_once(
+                lambda *_: pouring.set_step(label, step, total)
+            ),
+            on_done=lambda: Clock.schedule_once(lambda *_: self._finish_cleaning("done")),
+            on_stopped=lambda: Clock.schedule_once(lambda *_: self._finish_cleaning("stopped")),
+            on_error=lambda err: Clock.schedule_once(lambda *_: self._finish_cleaning("error", err)),
+            on_pause=lambda phase, wait_s: Clock.schedule_once(
+                lambda *_: setattr(pouring, "status_text", f"Move inlets to {phase} ({wait_s:.0f} s)")
+            ),
+        )
+
+    def _finish_cleaning(self, outcome: str, error: str = ""):
+        pouring = self.sm.get_screen("pouring")
+        pouring.stop_countdown(finished=outcome == "done")
+        if outcome == "done":
+            self._go_done("Cleaning done")
+        elif outcome == "stopped":
+            pouring.status_text = "Cleaning stopped"
+        else:
+            self.show_error(f"Cleaning error: {error}")
+
     def stop_pour(self):
         self.pour_manager.stop()
         self.pump_driver.stop_all()
 
-    def _go_done(self):
+    def _go_done(self, message: str = "Cocktail done"):
+        self.sm.get_screen("done").message = message
         self.sm.current = "done"
 
     def show_error(self, message: str):
+        events.emit("ui.error", message=message)
         self.stop_pour()
-        content = Popup(title="Error", size_hint=(0.8, 0.4))
-        btn = Button(text=f"{message}\n\nTap to go Home")
-        btn.bind(on_release=lambda *_: (content.dismiss(), self.go_home()))
-        content.content = btn
-        content.open()
+        self.dialogs.show_error(message)
 
     def on_stop(self):
         self.safe_shutdown()
@@ -163,6 +358,20 @@ class CocktailBotApp(MDApp):
             self.pour_manager.stop()
         except Exception:
             pass
+        try:
+            self.profiler.stop()
+        except Exception:
+            pass
+        try:
+            if self.input_listener is not None:
+                self.input_listener.close()
+        except Exception:
+            pass
+        try:
+            if self.scale_sampler is not None:
+                self.scale_sampler.stop()
+        except Exception:
+            pass
         try:
             self.pump_driver.stop_all()
         except Exception:
@@ -171,7 +380,12 @@ class CocktailBotApp(MDApp):
             self.pump_driver.close()
         except Exception:
             pass
+        events.emit("app.shutdown")
+        events.shutdown()
 
 
 if __name__ == "__main__":
-    CocktailBotApp().run()
+    app = CocktailBotApp()
+    app.run()
+    if app.soak_test is not None and app.soak_test.failures:
+        sys.exit(1)